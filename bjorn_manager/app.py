@@ -5,6 +5,7 @@ Main application: BJORNWebAPI + pywebview launcher.
 """
 
 import sys
+import io
 import os
 import re
 import time
@@ -14,9 +15,11 @@ import pathlib
 import tempfile
 import base64
 import logging
+import collections
+import functools
+import itertools
 import subprocess
 import urllib.request
-import urllib.error
 
 import webview
 
@@ -35,17 +38,137 @@ DEFAULT_PORT = 22
 EXTERNAL_HTML_FILENAME = "bjorn_ui.html"
 BRANCH_REPO_URL = "https://github.com/infinition/Bjorn.git"
 BRANCH_API_URL = "https://api.github.com/repos/infinition/Bjorn/branches?per_page=100"
+UI_QUEUE_MAXLEN = 4096  # oldest backend events are dropped past this point
+UI_BATCH_WINDOW = 0.032  # seconds to let backend log bursts accumulate
+DEVICE_BATCH_DELAY = 0.05  # seconds to coalesce device_found events
+BACKGROUND_WORKERS = 4  # short background actions allowed to run at once
+B64_CHUNK_SIZE = 64 * 1024  # multiple of 4 so every slice decodes independently
+_IP_RE = re.compile(r"^[0-9a-fA-F:.]{1,45}$")
 
 INSTALL_SH_FALLBACK = """#!/usr/bin/env bash
 echo -e "\\033[0;34m[INFO] Placeholder install_bjorn.sh (replace with real script).\\033[0m"
 exit 0
 """
 
-# Silence pywebview logger
-webview.logger.handlers.clear()
-webview.logger.propagate = False
-webview.logger.setLevel(logging.CRITICAL + 1)
-webview.logger.disabled = True
+# Static payload served to the advanced-config panel; built once at import.
+_INSTALLATION_OPTIONS = {
+    "success": True,
+    "options": {
+        "epd_versions": [
+            {"value": "epd2in13", "label": "epd2in13 (Original)"},
+            {"value": "epd2in13_V2", "label": "epd2in13_V2"},
+            {"value": "epd2in13_V3", "label": "epd2in13_V3"},
+            {"value": "epd2in13_V4", "label": "epd2in13_V4 (Recommended)"},
+            {"value": "epd2in7", "label": "epd2in7 (2.7 inch)"},
+        ],
+        "apt_packages": [
+            {"name": "python3-pip", "required": True, "description": "Python package manager"},
+            {"name": "wget", "required": True, "description": "Network downloader"},
+            {"name": "git", "required": True, "description": "Version control"},
+            {"name": "bluez", "required": True, "description": "Bluetooth stack"},
+            {"name": "bluez-tools", "required": True, "description": "Bluetooth tools"},
+            {"name": "python3-pil", "required": True, "description": "Python imaging library"},
+            {"name": "python3-dev", "required": True, "description": "Python development files"},
+            {"name": "python3-psutil", "required": True, "description": "System monitoring"},
+            {"name": "libgpiod-dev", "required": True, "description": "GPIO dev"},
+            {"name": "libi2c-dev", "required": True, "description": "I2C dev"},
+            {"name": "build-essential", "required": True, "description": "Build tools"},
+            {"name": "libopenjp2-7", "required": False, "description": "JPEG 2000 codec"},
+            {"name": "nmap", "required": False, "description": "Network exploration"},
+            {"name": "dhcpcd5", "required": False, "description": "DHCP client"},
+            {"name": "dnsmasq", "required": False, "description": "DNS/DHCP server"},
+            {"name": "gobuster", "required": False, "description": "Dir scanner"},
+            {"name": "arping", "required": False, "description": "ARP ping"},
+            {"name": "arp-scan", "required": False, "description": "ARP scanner"},
+            {"name": "libopenblas-dev", "required": False, "description": "BLAS"},
+            {"name": "python3-dbus", "required": False, "description": "D-Bus"},
+            {"name": "bridge-utils", "required": False, "description": "Bridge utils"},
+            {"name": "libjpeg-dev", "required": False, "description": "JPEG dev"},
+            {"name": "zlib1g-dev", "required": False, "description": "zlib dev"},
+            {"name": "libpng-dev", "required": False, "description": "PNG dev"},
+            {"name": "libffi-dev", "required": False, "description": "FFI"},
+            {"name": "libssl-dev", "required": False, "description": "SSL dev"},
+            {"name": "libssl1.1", "required": False, "description": "SSL runtime"},
+            {"name": "libatlas-base-dev", "required": False, "description": "ATLAS"},
+        ],
+        "pip_packages": [
+            {"name": "RPi.GPIO", "version": "0.7.1", "required": True},
+            {"name": "spidev", "version": "3.6", "required": True},
+            {"name": "pillow", "version": "10.4.0", "required": True},
+            {"name": "requests", "version": "2.32.3", "required": True},
+            {"name": "flask", "version": "3.0.3", "required": True},
+            {"name": "netifaces", "version": "0.11.0", "required": True},
+            {"name": "psutil", "version": "6.0.0", "required": True},
+            {"name": "paramiko", "version": "3.4.0", "required": True},
+            {"name": "scapy", "version": "2.5.0", "required": False},
+            {"name": "telnetlib3", "version": "2.0.4", "required": False},
+            {"name": "numpy", "version": "1.26.4", "required": False},
+            {"name": "cryptography", "version": "42.0.5", "required": False},
+            {"name": "pycryptodome", "version": "3.20.0", "required": False},
+        ],
+        "system_configs": [
+            {"key": "enable_spi", "label": "Enable SPI Interface", "default": True},
+            {"key": "enable_i2c", "label": "Enable I2C Interface", "default": True},
+            {"key": "enable_bluetooth", "label": "Enable Bluetooth Service", "default": True},
+            {"key": "enable_usb_gadget", "label": "Enable USB Gadget Mode", "default": True},
+            {"key": "configure_wifi", "label": "Configure WiFi from preconfigured file", "default": True},
+            {"key": "set_limits", "label": "Configure system limits (file descriptors)", "default": True},
+            {"key": "install_scripts", "label": "Install Bjorn helper scripts", "default": True},
+            {"key": "create_backup", "label": "Create initial backup archive", "default": True},
+            {"key": "setup_service", "label": "Setup systemd service", "default": True},
+            {"key": "configure_networking", "label": "Configure network interfaces", "default": True},
+        ],
+    },
+}
+
+
+def _silence_pywebview_logger() -> None:
+    """Mute pywebview's logger; called from main() so importing stays side-effect free."""
+    webview.logger.handlers.clear()
+    webview.logger.propagate = False
+    webview.logger.setLevel(logging.CRITICAL + 1)
+    webview.logger.disabled = True
+
+
+def _require_ssh(fn):
+    """Short-circuit a remote action with an error dict when SSH is down."""
+
+    @functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        worker = self.ssh_worker
+        if worker is None or not worker._connected:
+            return {"success": False, "error": "Not connected to SSH"}
+        return fn(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _DataURLReader(io.RawIOBase):
+    """Binary file object over a base64 ``data:`` URL, decoded as it is read.
+
+    Lets an uploaded archive stream straight into SFTP: decoding overlaps
+    the network writes and nothing touches the local disk.
+    """
+
+    def __init__(self, file_data: str) -> None:
+        self._data = file_data
+        self._offset = file_data.find(",") + 1
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._pending:
+            if self._offset >= len(self._data):
+                return 0
+            chunk = self._data[self._offset:self._offset + B64_CHUNK_SIZE]
+            self._offset += B64_CHUNK_SIZE
+            self._pending = memoryview(base64.b64decode(chunk))
+        n = min(len(buffer), len(self._pending))
+        buffer[:n] = self._pending[:n]
+        self._pending = self._pending[n:]
+        return n
 
 
 # ── BJORNWebAPI ──────────────────────────────────────────────────────────────
@@ -56,6 +179,9 @@ class BJORNWebAPI:
         self.discovery: Discovery | None = None
         self.window = None
         self.js = JSBridge()
+        # Short-lived background actions (connect, upload, restart, ...) share
+        # BACKGROUND_WORKERS slots; long-running monitors keep dedicated threads.
+        self._background_slots = threading.BoundedSemaphore(BACKGROUND_WORKERS)
 
         self._connected = False
         self._connected_ip: str | None = None
@@ -66,10 +192,46 @@ class BJORNWebAPI:
         self._log_stream_thread: threading.Thread | None = None
         self._log_stream_stop = threading.Event()
         self._custom_script_path: str | None = None
+        # Owned by the UI flusher thread; other threads queue events instead
+        self._seen_devices: set[tuple[str, str]] = set()
+        self._pending_devices: list[tuple] = []
+        self._pending_devices_lock = threading.Lock()
+        self._pending_devices_timer: threading.Timer | None = None
         self._prefs_lock = threading.Lock()
         self._prefs_path = self._resolve_prefs_path()
-        self._legacy_prefs_path = pathlib.Path.home() / ".bjorn_manager" / "preferences.json"
+        self._prefs_cache: dict | None = None
+        self._prefs_mtime: float | None = None
+        self._prefs_dir_ready = False
+        self._assets_dir_cached: str | None = None
+        self._install_script_cached: str | None = None
+        self._home = pathlib.Path.home()
+        self._default_key_cache: str | None = None
+        self._legacy_prefs_path = self._home / ".bjorn_manager" / "preferences.json"
         self._registry_base = r"Software\BJORNManager"
+        self._lang_cache: str | None = None
+
+        # Backend events (SSHWorker / Discovery threads) land in a bounded
+        # deque drained by a single flusher that coalesces log bursts.
+        self._ui_queue: collections.deque = collections.deque(maxlen=UI_QUEUE_MAXLEN)
+        self._ui_cond = threading.Condition()
+        self._ui_stop = False
+        self._ui_flusher = threading.Thread(
+            target=self._ui_flush_loop, name="bjorn-ui-flusher", daemon=True
+        )
+        self._ui_flusher.start()
+
+    def _run_background(self, fn, *args) -> None:
+        """Run *fn* on a daemon thread once a background slot is free.
+
+        Daemon threads (unlike executor workers, which are joined at exit)
+        let the app close in the middle of a long upload or install.
+        """
+
+        def runner():
+            with self._background_slots:
+                fn(*args)
+
+        threading.Thread(target=runner, name="bjorn-api", daemon=True).start()
 
     # ── Window lifecycle ─────────────────────────────────────────────────
 
@@ -79,6 +241,11 @@ class BJORNWebAPI:
 
     def on_loaded(self):
         """Called by window.events.loaded — the window is truly ready."""
+        # Fresh DOM, nothing rendered yet.  _seen_devices is only touched on
+        # the flusher thread, so the reset is queued like any other event.
+        with self._ui_cond:
+            self._ui_queue.append(("reset_seen_devices", ()))
+            self._ui_cond.notify()
         self.js.mark_ready()
         self.start_discovery()
 
@@ -88,6 +255,7 @@ class BJORNWebAPI:
                 self.ssh_worker.close()
             if self.discovery:
                 self.discovery.stop()
+            self._stop_ui_flusher()
             self.js.stop()
             if self.window:
                 self.window.destroy()
@@ -104,11 +272,15 @@ class BJORNWebAPI:
             return {"success": False, "error": str(e)}
 
     def get_default_ssh_key_path(self):
-        home_ssh = pathlib.Path(os.path.expanduser("~")) / ".ssh"
+        if self._default_key_cache is not None:
+            return self._default_key_cache
+        home_ssh = self._home / ".ssh"
         for name in ("id_ed25519", "id_rsa", "id_ecdsa"):
             p = home_ssh / name
             if p.exists():
-                return str(p)
+                self._default_key_cache = str(p)
+                return self._default_key_cache
+        # Nothing found yet: don't cache so a freshly generated key is picked up
         return str(home_ssh / "id_ed25519")
 
     def get_language(self):
@@ -131,15 +303,13 @@ class BJORNWebAPI:
             lang = (language or "en").strip().lower()
             if lang not in allowed:
                 lang = "en"
-            stored = False
-            if sys.platform == "win32":
-                stored = self._write_registry_language(lang) or stored
+            # The prefs file is authoritative; the registry is a best-effort mirror.
             prefs = self._read_prefs()
             prefs["language"] = lang
             self._write_prefs(prefs)
-            stored = True
-            if not stored:
-                return {"success": False, "error": "Failed to store language preference"}
+            if sys.platform == "win32":
+                self._lang_cache = lang
+                self._run_background(self._write_registry_language, lang)
             return {"success": True, "language": lang}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -204,10 +374,9 @@ class BJORNWebAPI:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @_require_ssh
     def delete_bjorn_folder(self):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
             if self._install_session and not self._install_session.get("finished"):
                 return {"success": False, "error": "Installation is still running"}
 
@@ -218,10 +387,9 @@ class BJORNWebAPI:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @_require_ssh
     def delete_install_script(self):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
             if self._install_session and not self._install_session.get("finished"):
                 return {"success": False, "error": "Installation is still running"}
 
@@ -235,35 +403,95 @@ class BJORNWebAPI:
     # ── Internal callback from SSHWorker / Discovery → JS ────────────────
 
     def _api_callback(self, event_type: str, *args):
-        if event_type == "log":
-            message, level = args
-            self.js.call("logMessage", message, level)
-        elif event_type == "progress":
+        with self._ui_cond:
+            if event_type == "events_batch":
+                # Discovery hands over device events already coalesced
+                self._ui_queue.extend((event[0], tuple(event[1:])) for event in args[0])
+            elif event_type == "log_batch":
+                # SSH worker output: one hand-off per received chunk
+                lines, level = args
+                self._ui_queue.extend(("log", (line, level)) for line in lines)
+            else:
+                self._ui_queue.append((event_type, args))
+            self._ui_cond.notify()
+
+    def _ui_flush_loop(self) -> None:
+        while True:
+            with self._ui_cond:
+                while not self._ui_queue and not self._ui_stop:
+                    self._ui_cond.wait()
+                if self._ui_stop and not self._ui_queue:
+                    return
+            # Let a burst (journalctl / installer output) accumulate so it
+            # ships to the page as a single logMessages call.
+            if not self._ui_stop:
+                time.sleep(UI_BATCH_WINDOW)
+            with self._ui_cond:
+                batch = list(self._ui_queue)
+                self._ui_queue.clear()
+
+            logs: list[list[str]] = []
+            for event_type, args in batch:
+                if event_type == "log":
+                    logs.append(list(args))
+                    continue
+                if logs:
+                    self.js.call("logMessages", logs)
+                    logs = []
+                try:
+                    self._dispatch_ui_event(event_type, args)
+                except Exception as exc:
+                    print(f"[ERROR] UI event {event_type}: {exc}")
+            if logs:
+                self.js.call("logMessages", logs)
+
+    def _stop_ui_flusher(self) -> None:
+        with self._ui_cond:
+            self._ui_stop = True
+            self._ui_cond.notify()
+        if self._ui_flusher.is_alive():
+            self._ui_flusher.join(timeout=2)
+
+    def _dispatch_ui_event(self, event_type: str, args: tuple) -> None:
+        # "log" events never get here: _ui_flush_loop batches them into
+        # logMessages itself.
+        if event_type == "progress":
             current, total, text = args
             self.js.call("updateProgress", current, total, text)
         elif event_type == "device_found":
             label, ip = args[0], args[1]
             has_webapp = args[2] if len(args) > 2 else False
-            self.js.call("addDevice", label, ip, has_webapp)
+            if (label, ip) in self._seen_devices:
+                return
+            self._seen_devices.add((label, ip))
+            with self._pending_devices_lock:
+                self._pending_devices.append([label, ip, bool(has_webapp)])
+                if self._pending_devices_timer is None:
+                    self._pending_devices_timer = threading.Timer(
+                        DEVICE_BATCH_DELAY, self._flush_pending_devices
+                    )
+                    self._pending_devices_timer.daemon = True
+                    self._pending_devices_timer.start()
+        elif event_type == "reset_seen_devices":
+            self._seen_devices.clear()
         elif event_type == "device_gone":
             ip = args[0]
+            self._seen_devices.difference_update(
+                [key for key in self._seen_devices if key[1] == ip]
+            )
             self.js.call("markDeviceOffline", ip)
         elif event_type == "webapp_status":
             ip, status = args
-            status_js = "true" if status else "false"
-            self.js.call_raw(f"""
-            (function(){{
-                var dc=document.querySelector('[data-ip="{ip}"]');
-                if(!dc) return;
-                var icon=dc.querySelector('.webapp-icon');
-                if({status_js}){{
-                    if(!icon){{
-                        dc.innerHTML+='<img src="https://i.postimg.cc/bwN9ScGQ/Chat-GPT-Image-21-ao-t-2025-23-04-20.png" class="webapp-icon" onclick="openWebapp(\\'{ip}\\')" title="Open WebUI">';
-                    }}
-                }} else {{
-                    if(icon) icon.remove();
-                }}
-            }})()""")
+            if not isinstance(ip, str) or not _IP_RE.match(ip):
+                return
+            self.js.call("setWebappStatus", ip, bool(status))
+
+    def _flush_pending_devices(self) -> None:
+        with self._pending_devices_lock:
+            batch, self._pending_devices = self._pending_devices, []
+            self._pending_devices_timer = None
+        if batch:
+            self.js.call("addDevices", batch)
 
     # ── Discovery ────────────────────────────────────────────────────────
 
@@ -285,17 +513,28 @@ class BJORNWebAPI:
         try:
             if self._connect_in_progress:
                 return {"success": False, "error": "SSH connection already in progress"}
-            self._connect_in_progress = True
-            if self.ssh_worker:
-                self.ssh_worker.close()
-
             ssh_config = SSHConfig(
                 host=config["host"],
-                port=config["port"],
+                port=int(config["port"]),
                 user=config["user"],
                 password=config.get("password"),
                 key_path=config.get("privateKeyPath") if config.get("usePrivateKey") else None,
             )
+            worker = self.ssh_worker
+            # SSHConfig equality covers host, port, user and the credentials,
+            # so a changed password or key always gets a fresh session.
+            if (
+                worker is not None
+                and worker._connected
+                and config["host"] == self._connected_ip
+                and ssh_config == worker._config
+            ):
+                # Same target: keep the authenticated session instead of reconnecting.
+                self.js.call("setConnectionStatus", True, config["host"])
+                return {"success": True}
+            self._connect_in_progress = True
+            if worker:
+                worker.close()
 
             def connect_thread():
                 try:
@@ -304,9 +543,6 @@ class BJORNWebAPI:
                     if success:
                         self._connected = True
                         self._connected_ip = config["host"]
-                        # Stop discovery — not needed while connected
-                        if self.discovery:
-                            self.discovery.stop()
                         self.js.call("setConnectionStatus", True, config["host"])
                         if self._install_session and not self._install_session.get("finished"):
                             self._installation_mode = True
@@ -322,7 +558,7 @@ class BJORNWebAPI:
                 finally:
                     self._connect_in_progress = False
 
-            threading.Thread(target=connect_thread, daemon=True).start()
+            self._run_background(connect_thread)
             return {"success": True}
         except Exception as e:
             self._connect_in_progress = False
@@ -354,39 +590,38 @@ class BJORNWebAPI:
                 self._installation_mode = False
                 self.js.call("setInstallationMode", False)
 
-            # Reset discovery instead of destroy+recreate
+            # Discovery keeps running through SSH sessions; only start it if missing
             if self.discovery:
-                self.discovery.reset()
+                self.js.call("logMessage", "Network discovery already running", "info")
             else:
                 self.start_discovery()
-            self.js.call("logMessage", "Periodic discovery restarted", "info")
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
     # ── File upload ──────────────────────────────────────────────────────
 
+    @_require_ssh
     def upload_files(self, mode, file_data=None):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
             self.js.call("logMessage", f"Starting upload in {mode} mode...", "info")
 
             def upload_thread():
                 try:
+                    # Archives are decoded straight into the SFTP stream
                     if mode == "local" and file_data:
-                        temp_file = self._save_temp_file(file_data, "bjorn_packages.tar.gz")
-                        self.ssh_worker.upload_file(temp_file, "/home/bjorn/bjorn_packages.tar.gz")
-                        os.unlink(temp_file)
+                        self.ssh_worker.upload_fileobj(
+                            _DataURLReader(file_data),
+                            "/home/bjorn/bjorn_packages.tar.gz",
+                            "bjorn_packages.tar.gz",
+                        )
                     elif mode == "debug" and file_data:
-                        temp_file = self._save_temp_file(file_data, "Bjorn.zip")
-                        self.ssh_worker.deploy_bjorn_zip(temp_file)
-                        os.unlink(temp_file)
+                        self.ssh_worker.deploy_bjorn_zip_stream(_DataURLReader(file_data))
                     self.js.call("logMessage", "Upload completed successfully", "success")
                 except Exception as e:
                     self.js.call("logMessage", f"Upload failed: {e}", "error")
 
-            threading.Thread(target=upload_thread, daemon=True).start()
+            self._run_background(upload_thread)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -407,10 +642,9 @@ class BJORNWebAPI:
 
     # ── Installation ─────────────────────────────────────────────────────
 
+    @_require_ssh
     def install_bjorn(self, config):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
             if self._installation_mode:
                 return {"success": False, "error": "Installation already in progress"}
             self._installation_mode = True
@@ -462,7 +696,7 @@ class BJORNWebAPI:
                     self._install_session = None
                     self.js.call("setInstallationMode", False)
 
-            threading.Thread(target=install_thread, daemon=True).start()
+            self._run_background(install_thread)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -500,10 +734,9 @@ class BJORNWebAPI:
         self._install_monitor_thread = threading.Thread(target=monitor_thread, daemon=True)
         self._install_monitor_thread.start()
 
+    @_require_ssh
     def resume_install_logs(self):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
             if not self._install_session:
                 return {"success": False, "error": "No remote installation session to resume"}
             if self._install_session.get("finished"):
@@ -516,10 +749,9 @@ class BJORNWebAPI:
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @_require_ssh
     def stop_install(self):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
             if not self._install_session:
                 return {"success": False, "error": "No remote installation session is active"}
 
@@ -540,80 +772,14 @@ class BJORNWebAPI:
     # ── Advanced config / script generation ──────────────────────────────
 
     def get_installation_options(self):
-        return {
-            "success": True,
-            "options": {
-                "epd_versions": [
-                    {"value": "epd2in13", "label": "epd2in13 (Original)"},
-                    {"value": "epd2in13_V2", "label": "epd2in13_V2"},
-                    {"value": "epd2in13_V3", "label": "epd2in13_V3"},
-                    {"value": "epd2in13_V4", "label": "epd2in13_V4 (Recommended)"},
-                    {"value": "epd2in7", "label": "epd2in7 (2.7 inch)"},
-                ],
-                "apt_packages": [
-                    {"name": "python3-pip", "required": True, "description": "Python package manager"},
-                    {"name": "wget", "required": True, "description": "Network downloader"},
-                    {"name": "git", "required": True, "description": "Version control"},
-                    {"name": "bluez", "required": True, "description": "Bluetooth stack"},
-                    {"name": "bluez-tools", "required": True, "description": "Bluetooth tools"},
-                    {"name": "python3-pil", "required": True, "description": "Python imaging library"},
-                    {"name": "python3-dev", "required": True, "description": "Python development files"},
-                    {"name": "python3-psutil", "required": True, "description": "System monitoring"},
-                    {"name": "libgpiod-dev", "required": True, "description": "GPIO dev"},
-                    {"name": "libi2c-dev", "required": True, "description": "I2C dev"},
-                    {"name": "build-essential", "required": True, "description": "Build tools"},
-                    {"name": "libopenjp2-7", "required": False, "description": "JPEG 2000 codec"},
-                    {"name": "nmap", "required": False, "description": "Network exploration"},
-                    {"name": "dhcpcd5", "required": False, "description": "DHCP client"},
-                    {"name": "dnsmasq", "required": False, "description": "DNS/DHCP server"},
-                    {"name": "gobuster", "required": False, "description": "Dir scanner"},
-                    {"name": "arping", "required": False, "description": "ARP ping"},
-                    {"name": "arp-scan", "required": False, "description": "ARP scanner"},
-                    {"name": "libopenblas-dev", "required": False, "description": "BLAS"},
-                    {"name": "python3-dbus", "required": False, "description": "D-Bus"},
-                    {"name": "bridge-utils", "required": False, "description": "Bridge utils"},
-                    {"name": "libjpeg-dev", "required": False, "description": "JPEG dev"},
-                    {"name": "zlib1g-dev", "required": False, "description": "zlib dev"},
-                    {"name": "libpng-dev", "required": False, "description": "PNG dev"},
-                    {"name": "libffi-dev", "required": False, "description": "FFI"},
-                    {"name": "libssl-dev", "required": False, "description": "SSL dev"},
-                    {"name": "libssl1.1", "required": False, "description": "SSL runtime"},
-                    {"name": "libatlas-base-dev", "required": False, "description": "ATLAS"},
-                ],
-                "pip_packages": [
-                    {"name": "RPi.GPIO", "version": "0.7.1", "required": True},
-                    {"name": "spidev", "version": "3.6", "required": True},
-                    {"name": "pillow", "version": "10.4.0", "required": True},
-                    {"name": "requests", "version": "2.32.3", "required": True},
-                    {"name": "flask", "version": "3.0.3", "required": True},
-                    {"name": "netifaces", "version": "0.11.0", "required": True},
-                    {"name": "psutil", "version": "6.0.0", "required": True},
-                    {"name": "paramiko", "version": "3.4.0", "required": True},
-                    {"name": "scapy", "version": "2.5.0", "required": False},
-                    {"name": "telnetlib3", "version": "2.0.4", "required": False},
-                    {"name": "numpy", "version": "1.26.4", "required": False},
-                    {"name": "cryptography", "version": "42.0.5", "required": False},
-                    {"name": "pycryptodome", "version": "3.20.0", "required": False},
-                ],
-                "system_configs": [
-                    {"key": "enable_spi", "label": "Enable SPI Interface", "default": True},
-                    {"key": "enable_i2c", "label": "Enable I2C Interface", "default": True},
-                    {"key": "enable_bluetooth", "label": "Enable Bluetooth Service", "default": True},
-                    {"key": "enable_usb_gadget", "label": "Enable USB Gadget Mode", "default": True},
-                    {"key": "configure_wifi", "label": "Configure WiFi from preconfigured file", "default": True},
-                    {"key": "set_limits", "label": "Configure system limits (file descriptors)", "default": True},
-                    {"key": "install_scripts", "label": "Install Bjorn helper scripts", "default": True},
-                    {"key": "create_backup", "label": "Create initial backup archive", "default": True},
-                    {"key": "setup_service", "label": "Setup systemd service", "default": True},
-                    {"key": "configure_networking", "label": "Configure network interfaces", "default": True},
-                ],
-            },
-        }
+        return _INSTALLATION_OPTIONS
 
     def generate_custom_installer(self, config):
         try:
             self.js.call("logMessage", "Generating custom installer script...", "info")
-            temp_path = ScriptGenerator.generate(config)
+            # Inline the local lib/ modules: the custom script is uploaded alone.
+            lib_dir = os.path.join(self._get_assets_dir(), "lib")
+            temp_path = ScriptGenerator.generate(config, lib_dir=lib_dir)
             self._custom_script_path = temp_path
 
             apt_count = len(config.get("apt_packages", []))
@@ -632,10 +798,9 @@ class BJORNWebAPI:
 
     # ── Remote actions ───────────────────────────────────────────────────
 
+    @_require_ssh
     def restart_bjorn(self):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
 
             def restart_thread():
                 try:
@@ -643,15 +808,14 @@ class BJORNWebAPI:
                 except Exception as e:
                     self.js.call("logMessage", f"Restart error: {e}", "error")
 
-            threading.Thread(target=restart_thread, daemon=True).start()
+            self._run_background(restart_thread)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @_require_ssh
     def change_epd_type(self, epd_version):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
 
             def change_thread():
                 try:
@@ -659,15 +823,14 @@ class BJORNWebAPI:
                 except Exception as e:
                     self.js.call("logMessage", f"EPD change error: {e}", "error")
 
-            threading.Thread(target=change_thread, daemon=True).start()
+            self._run_background(change_thread)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
 
+    @_require_ssh
     def stream_logs(self):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
             if self._log_stream_thread and self._log_stream_thread.is_alive():
                 return {"success": False, "error": "Log streaming already active"}
 
@@ -690,10 +853,9 @@ class BJORNWebAPI:
         self.js.call("logMessage", "Log streaming stopped", "warning")
         return {"success": True}
 
+    @_require_ssh
     def reboot_target(self):
         try:
-            if not self.ssh_worker or not self.ssh_worker._connected:
-                return {"success": False, "error": "Not connected to SSH"}
 
             def reboot_thread():
                 try:
@@ -703,7 +865,7 @@ class BJORNWebAPI:
                 except Exception as e:
                     self.js.call("logMessage", f"Reboot error: {e}", "error")
 
-            threading.Thread(target=reboot_thread, daemon=True).start()
+            self._run_background(reboot_thread)
             return {"success": True}
         except Exception as e:
             return {"success": False, "error": str(e)}
@@ -740,12 +902,11 @@ class BJORNWebAPI:
             if not os.path.exists(script_path):
                 return {"success": False, "error": "Script file not found"}
             with open(script_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            preview_lines = lines[:20]
+                preview_lines = list(itertools.islice(f, 20))
             return {
                 "success": True,
                 "preview": "".join(preview_lines),
-                "total_lines": len(lines),
+                "total_lines": _count_lines(script_path),
                 "showing_lines": len(preview_lines),
             }
         except Exception as e:
@@ -754,50 +915,91 @@ class BJORNWebAPI:
     # ── Helpers ──────────────────────────────────────────────────────────
 
     def _save_temp_file(self, file_data: str, filename: str) -> str:
-        file_content = base64.b64decode(file_data.split(",")[1])
-        temp_dir = tempfile.gettempdir()
-        temp_path = os.path.join(temp_dir, filename)
-        with open(temp_path, "wb") as f:
-            f.write(file_content)
-        return temp_path
+        """Decode a ``data:`` URL payload to a temp file, chunk by chunk.
+
+        Decoding in 4-char-aligned slices keeps peak memory flat instead of
+        materialising the whole decoded archive next to the base64 string.
+        """
+        start = file_data.find(",") + 1
+        with tempfile.NamedTemporaryFile(
+            "wb",
+            delete=False,
+            dir=tempfile.gettempdir(),
+            prefix="bjorn_",
+            suffix=f"_{os.path.basename(filename)}",
+        ) as f:
+            for offset in range(start, len(file_data), B64_CHUNK_SIZE):
+                f.write(base64.b64decode(file_data[offset:offset + B64_CHUNK_SIZE]))
+            return f.name
 
     def _get_assets_dir(self) -> str:
-        """Return the path to the assets/ directory containing install scripts."""
-        base = pathlib.Path(__file__).resolve().parent.parent
-        assets_dir = base / "assets"
+        """Return the path to the assets/ directory containing install scripts.
+
+        The directory is resolved once per process; it never moves while the
+        application is running.
+        """
+        if self._assets_dir_cached is not None:
+            return self._assets_dir_cached
+        assets_dir = get_base_path() / "assets"
         if (assets_dir / "install_bjorn.sh").exists():
-            return str(assets_dir)
+            self._assets_dir_cached = str(assets_dir)
+            return self._assets_dir_cached
         # Fallback: create a minimal script in-place
         try:
             assets_dir.mkdir(parents=True, exist_ok=True)
             (assets_dir / "install_bjorn.sh").write_text(
                 INSTALL_SH_FALLBACK, encoding="utf-8"
             )
+            self._assets_dir_cached = str(assets_dir)
         except Exception:
             pass
         return str(assets_dir)
 
     def _get_install_script(self) -> str:
         """Legacy: return path to install_bjorn.sh."""
-        return os.path.join(self._get_assets_dir(), "install_bjorn.sh")
+        if self._install_script_cached is None:
+            self._install_script_cached = os.path.join(self._get_assets_dir(), "install_bjorn.sh")
+        return self._install_script_cached
 
     def _read_prefs(self) -> dict:
+        """Return a copy of the preferences, re-reading the file only when its mtime changes."""
         with self._prefs_lock:
             self._migrate_legacy_prefs_if_needed()
             try:
-                if self._prefs_path.exists():
-                    return json.loads(self._prefs_path.read_text(encoding="utf-8"))
+                mtime = self._prefs_path.stat().st_mtime
+            except OSError:
+                self._prefs_cache = None
+                self._prefs_mtime = None
+                return {}
+            if self._prefs_cache is not None and mtime == self._prefs_mtime:
+                return dict(self._prefs_cache)
+            try:
+                prefs = json.loads(self._prefs_path.read_text(encoding="utf-8"))
             except Exception:
-                pass
-            return {}
+                return {}
+            self._prefs_cache = prefs if isinstance(prefs, dict) else {}
+            self._prefs_mtime = mtime
+            return dict(self._prefs_cache)
 
     def _write_prefs(self, prefs: dict) -> None:
         with self._prefs_lock:
-            self._prefs_path.parent.mkdir(parents=True, exist_ok=True)
-            self._prefs_path.write_text(
+            if not self._prefs_dir_ready:
+                self._prefs_path.parent.mkdir(parents=True, exist_ok=True)
+                self._prefs_dir_ready = True
+            # Write to a sibling temp file then rename so a crash never leaves
+            # a truncated preferences.json behind.
+            tmp_path = self._prefs_path.with_suffix(".json.tmp")
+            tmp_path.write_text(
                 json.dumps(prefs, ensure_ascii=False, indent=2),
                 encoding="utf-8",
             )
+            os.replace(tmp_path, self._prefs_path)
+            self._prefs_cache = dict(prefs)
+            try:
+                self._prefs_mtime = self._prefs_path.stat().st_mtime
+            except OSError:
+                self._prefs_cache = None
+                self._prefs_mtime = None
 
     def _resolve_prefs_path(self) -> pathlib.Path:
         if sys.platform == "win32":
@@ -824,13 +1026,16 @@ class BJORNWebAPI:
     def _read_registry_language(self) -> str | None:
         if sys.platform != "win32":
             return None
+        if self._lang_cache is not None:
+            return self._lang_cache
         try:
             import winreg  # type: ignore
 
             with winreg.OpenKey(winreg.HKEY_CURRENT_USER, self._registry_base, 0, winreg.KEY_READ) as key:
                 value, _ = winreg.QueryValueEx(key, "Language")
             if isinstance(value, str) and value.strip():
-                return value.strip().lower()
+                self._lang_cache = value.strip().lower()
+                return self._lang_cache
         except Exception:
             pass
         return None
@@ -843,11 +1048,31 @@ class BJORNWebAPI:
 
             with winreg.CreateKey(winreg.HKEY_CURRENT_USER, self._registry_base) as key:
                 winreg.SetValueEx(key, "Language", 0, winreg.REG_SZ, lang)
+            self._lang_cache = lang
             return True
         except Exception:
             return False
 
 
+def _count_lines(path: str) -> int:
+    """Count lines like text-mode ``readlines()`` would, in 1 MiB byte blocks.
+
+    Universal newlines apply: ``\n``, ``\r\n`` and a lone ``\r`` each end
+    a line.
+    """
+    count = 0
+    last = b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            count += block.count(b"\n") + block.count(b"\r") - block.count(b"\r\n")
+            if last == b"\r" and block[:1] == b"\n":
+                count -= 1  # a \r\n split across two blocks
+            last = block[-1:]
+    if last and last not in (b"\n", b"\r"):
+        count += 1
+    return count
+
+
 # ── HTML loader ──────────────────────────────────────────────────────────────
 
 def get_base_path() -> pathlib.Path:
@@ -870,6 +1095,7 @@ def get_window_source():
 
 def main():
     os.environ["PYTHONUTF8"] = "1"
+    _silence_pywebview_logger()
     api = BJORNWebAPI()
 
     src = get_window_source()
@@ -900,6 +1126,7 @@ def main():
         print(f"[ERROR] webview.start failed: {e}")
 
     # Cleanup on exit
+    api._stop_ui_flusher()
     api.js.stop()
     if api.discovery:
         api.discovery.stop()
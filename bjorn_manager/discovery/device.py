@@ -1,22 +1,45 @@
 """Device alias manager — assigns stable numbered aliases to discovered Bjorn devices."""
 
 import json
+import os
+import threading
 from typing import Optional
 
+try:  # optional C-accelerated JSON; the stdlib json module is the fallback
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 
 class DeviceAliasManager:
     """Maps device IDs to persistent human-readable aliases like 'Bjorn 1'.
 
     If *path* is given, the mapping is persisted as JSON on disk so aliases
     survive across application restarts.  When *path* is ``None`` the mapping
-    lives only in memory (numbering restarts each run).
+    lives only in memory (numbering restarts each run).  Writes are
+    debounced by ``SAVE_DELAY`` seconds and replace the file atomically.
     """
 
+    SAVE_DELAY = 1.0
+
     def __init__(self, path: Optional[str] = None):
         self.path = path
         self.map: dict[str, str] = {}
+        self._dirty = False
+        # Guards map/_used/_next_free: alias_for runs on discovery threads
+        # while the save timer serialises the map.
+        self._map_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
         if self.path:
             self._load()
+        # Used indices are tracked incrementally so allocation is amortised O(1)
+        self._used: set[int] = set()
+        self._next_free = 1
+        for alias in self.map.values():
+            index = self._alias_index(alias)
+            if index is not None:
+                self._used.add(index)
 
     # ------------------------------------------------------------------
     # Persistence
@@ -24,43 +47,86 @@ class DeviceAliasManager:
 
     def _load(self) -> None:
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                self.map = json.load(f)
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            self.map = orjson.loads(raw) if orjson is not None else json.loads(raw)
         except Exception:
             self.map = {}
 
     def _save(self) -> None:
+        """Atomically write the mapping if it changed since the last save."""
+        with self._save_lock:
+            self._save_timer = None
+            if not self.path or not self._dirty:
+                return
+            with self._map_lock:
+                # Cleared with the snapshot, so a change made while writing
+                # leaves the manager dirty for the next save.
+                snapshot = dict(self.map)
+                self._dirty = False
+            tmp_path = self.path + ".tmp"
+            try:
+                if orjson is not None:
+                    payload = orjson.dumps(snapshot, option=orjson.OPT_INDENT_2)
+                else:
+                    payload = json.dumps(snapshot, indent=2, ensure_ascii=False).encode("utf-8")
+                with open(tmp_path, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                self._dirty = True
+
+    def _schedule_save(self) -> None:
+        """Debounce saves so discovery threads never block on disk I/O."""
         if not self.path:
             return
-        try:
-            with open(self.path, "w", encoding="utf-8") as f:
-                json.dump(self.map, f, indent=2, ensure_ascii=False)
-        except Exception:
-            pass
+        with self._save_lock:
+            if self._save_timer is None:
+                self._save_timer = threading.Timer(self.SAVE_DELAY, self._save)
+                self._save_timer.daemon = True
+                self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write any pending alias changes to disk immediately."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+        self._save()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _alias_index(alias: str) -> Optional[int]:
+        """Return the number in a ``Bjorn N`` alias, or ``None``."""
+        if alias.lower().startswith("bjorn "):
+            try:
+                return int(alias.split()[-1])
+            except Exception:
+                pass
+        return None
+
     def _next_index(self) -> int:
-        """Return the lowest unused Bjorn index (1-based)."""
-        used: set[int] = set()
-        for alias in self.map.values():
-            if alias.lower().startswith("bjorn "):
-                try:
-                    used.add(int(alias.split()[-1]))
-                except Exception:
-                    pass
-        n = 1
-        while n in used:
-            n += 1
+        """Claim and return the lowest unused Bjorn index (1-based).
+
+        Caller holds ``_map_lock``.
+        """
+        while self._next_free in self._used:
+            self._next_free += 1
+        n = self._next_free
+        self._used.add(n)
+        self._next_free += 1
         return n
 
     def alias_for(self, device_id: str) -> str:
         """Return the alias for *device_id*, creating one if needed."""
-        if device_id in self.map:
-            return self.map[device_id]
-        alias = f"Bjorn {self._next_index()}"
-        self.map[device_id] = alias
-        self._save()
+        with self._map_lock:
+            alias = self.map.get(device_id)
+            if alias is not None:
+                return alias
+            alias = f"Bjorn {self._next_index()}"
+            self.map[device_id] = alias
+            self._dirty = True
+        self._schedule_save()
         return alias
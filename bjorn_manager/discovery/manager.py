@@ -1,7 +1,8 @@
 """Network discovery for Bjorn devices.
 
-Combines mDNS browsing, CIDR TCP scanning, and periodic port-8000
-polling to locate Bjorn devices on USB, Bluetooth, and LAN interfaces.
+Combines mDNS browsing, CIDR TCP scanning (PAN links, plus the LAN as a
+fallback when mDNS is silent), and periodic port-8000 polling to locate
+Bjorn devices on USB, Bluetooth, and LAN interfaces.
 
 Key improvements over v10
 -------------------------
@@ -10,26 +11,50 @@ Key improvements over v10
 * ``Zeroconf()`` is created inside ``start()``, not ``__init__()`` — avoids
   leaking sockets when ``start()`` is never called.
 * ``reset()`` performs a clean stop-then-start cycle.
-* ``_port8000_poll`` probes IPs in parallel via a ``ThreadPoolExecutor``.
+* CIDR scans and ``_port8000_poll`` probe whole batches of IPs with
+  non-blocking connects multiplexed on one ``selectors`` selector.
 * ``strict_bjorn_only`` is a constructor parameter (default ``True``).
 """
 
 from __future__ import annotations
 
+import errno
 import ipaddress
-import queue
+import itertools
+import re
+import selectors
 import socket
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Optional
 
 import netifaces
-from zeroconf import ServiceBrowser, Zeroconf
+from zeroconf import ServiceBrowser, ServiceListener, Zeroconf
 
 from bjorn_manager.discovery.device import DeviceAliasManager
 
 
+# "bjorn", "bjorn-*", "bjorn_*", or any "bjorn*.local" / "bjorn*.home"
+_BJORN_HOST_RE = re.compile(r"bjorn(?:[-_].*|.*\.(?:local|home))?\Z", re.S)
+
+
+class _BjornServiceListener(ServiceListener):
+    """Forward mDNS add/update notifications to :meth:`Discovery._on_service`."""
+
+    def __init__(self, discovery: "Discovery") -> None:
+        self._discovery = discovery
+
+    def add_service(self, zc: Zeroconf, type_: str, name: str) -> None:
+        self._discovery._on_service(zc, type_, name)
+
+    def update_service(self, zc: Zeroconf, type_: str, name: str) -> None:
+        self._discovery._on_service(zc, type_, name)
+
+    def remove_service(self, zc: Zeroconf, type_: str, name: str) -> None:
+        pass  # stale devices are expired by the sweeper
+
+
 class Discovery:
     """Discover Bjorn devices on the local network.
 
@@ -39,25 +64,47 @@ class Discovery:
         ``callback(event_type, *args)`` invoked for discovery events:
 
         * ``('log', message, level)``
-        * ``('device_found', alias, ip, has_webapp)``
-        * ``('device_gone', ip)``
-        * ``('webapp_status', ip, up_bool)``
+        * ``('events_batch', [(event_type, *args), ...])`` — device events
+          below, coalesced every ``EVENT_FLUSH_INTERVAL`` seconds:
+
+          * ``('device_found', alias, ip, has_webapp)``
+          * ``('device_gone', ip)``
+          * ``('webapp_status', ip, up_bool)``
     strict_bjorn_only:
         When ``True`` (default) only devices whose hostname matches known
         Bjorn naming patterns are emitted.
+    fallback_cidr:
+        When ``True`` the gateway subnet is always TCP-scanned.  By default it
+        is only scanned when no mDNS answer arrives within
+        ``MDNS_GRACE_SECONDS``; the USB/Bluetooth PAN ranges, which carry no
+        multicast, are always scanned.
     """
 
+    MDNS_SERVICE_TYPES = ("_bjorn._tcp.local.", "_ssh._tcp.local.", "_workstation._tcp.local.")
+    PAN_CIDRS = ("172.20.1.0/24", "172.20.2.0/24")
+    MDNS_GRACE_SECONDS = 5.0
+    WEB_STATUS_MAX_AGE = 25.0
+    RDNS_TIMEOUT = 2.0
+    SCAN_BATCH_SIZE = 256
+    EVENT_FLUSH_INTERVAL = 0.2
+
     def __init__(
         self,
         api_callback: Optional[Callable] = None,
         strict_bjorn_only: bool = True,
+        fallback_cidr: bool = False,
     ):
         self.api_callback = api_callback
         self.strict_bjorn_only = strict_bjorn_only
+        self.fallback_cidr = fallback_cidr
+        self._mdns_hit = threading.Event()
+        # Set by an mDNS hit or by stop(); ends the CIDR loop's grace wait
+        self._scan_wake = threading.Event()
 
         # Zeroconf instance — created lazily in start()
         self.zeroconf: Optional[Zeroconf] = None
         self.browsers: list[ServiceBrowser] = []
+        self._listener = _BjornServiceListener(self)
 
         # Thread-safe set of discovered IPs
         self._seen_ips: set[str] = set()
@@ -65,23 +112,36 @@ class Discovery:
 
         # Internal state
         self._stop = False
+        self._stop_event = threading.Event()
         self._cidr_thread: Optional[threading.Thread] = None
         self._port8000_thread: Optional[threading.Thread] = None
         self._sweeper_thread: Optional[threading.Thread] = None
+        self._emit_pool: Optional[ThreadPoolExecutor] = None
+        self._scan_pool: Optional[ThreadPoolExecutor] = None
+        self._event_thread: Optional[threading.Thread] = None
+
+        # Device events waiting for the next batched callback
+        self._event_queue: list[tuple] = []
+        self._event_lock = threading.Lock()
 
         # Alias numbering restarts each run (no persistence path)
         self.alias_mgr = DeviceAliasManager(path=None)
 
         self._id_by_ip: dict[str, str] = {}
-        self._web_status_prev: dict[str, bool] = {}
+        # ip -> reverse DNS name, for this run only.  Failures are not kept:
+        # a Bjorn's PTR often appears only after the router learns its name.
+        self._rdns_cache: dict[str, str] = {}
+        # ip -> (webapp_up, monotonic timestamp of the last observation)
+        self._web_status_cache: dict[str, tuple[bool, float]] = {}
         # device_key -> {"alias": str, "ips": set[str], "last_seen": float}
         self._registry: dict[str, dict] = {}
         self._registry_lock = threading.Lock()
         self._stale_timeout: float = 90  # seconds before a device is marked offline
 
-        # IPs to always ignore (gateways, routers, self)
-        self._ignored_ips: set[str] = set()
-        self._build_ignored_ips()
+        # Routing table snapshot and IPs to always ignore (gateways, routers,
+        # self); both are refreshed by start() so network changes are seen
+        self._gateways: dict = {}
+        self._ignored_ips: frozenset[str] = frozenset()
 
     # ------------------------------------------------------------------
     # Lifecycle
@@ -90,7 +150,18 @@ class Discovery:
     def start(self) -> None:
         """Begin discovery (mDNS + CIDR scan + sweeper)."""
         self._stop = False
+        self._stop_event.clear()
+        self._scan_wake.clear()
         self._log("[DEBUG] Starting network discovery...")
+        # netifaces.gateways() scans the routing table; once per run
+        try:
+            self._gateways = netifaces.gateways()
+        except Exception:
+            self._gateways = {}
+        self._build_ignored_ips()
+        self._rdns_cache.clear()
+        self._emit_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bjorn-emit")
+        self._scan_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="bjorn-scan")
 
         # Create Zeroconf here to avoid socket leak if start() is never called
         try:
@@ -103,9 +174,9 @@ class Discovery:
         if self.zeroconf is not None:
             try:
                 self.browsers = []
-                for stype in ("_ssh._tcp.local.", "_workstation._tcp.local."):
+                for stype in self.MDNS_SERVICE_TYPES:
                     browser = ServiceBrowser(
-                        self.zeroconf, stype, handlers=[self._on_service]
+                        self.zeroconf, stype, listener=self._listener
                     )
                     self.browsers.append(browser)
                 self._log("[DEBUG] mDNS browsers started")
@@ -131,10 +202,18 @@ class Discovery:
         except Exception as exc:
             self._log(f"[DEBUG] Sweeper start failed: {exc}", "error")
 
+        # Event flusher thread
+        self._event_thread = threading.Thread(
+            target=self._event_flush_loop, daemon=True
+        )
+        self._event_thread.start()
+
     def stop(self) -> None:
         """Stop all discovery activity and release resources."""
         self._log("[DEBUG] Stopping network discovery...")
         self._stop = True
+        self._stop_event.set()
+        self._scan_wake.set()
 
         if self._cidr_thread and self._cidr_thread.is_alive():
             self._cidr_thread.join(timeout=2)
@@ -142,6 +221,8 @@ class Discovery:
             self._port8000_thread.join(timeout=2)
         if self._sweeper_thread and self._sweeper_thread.is_alive():
             self._sweeper_thread.join(timeout=2)
+        if self._event_thread and self._event_thread.is_alive():
+            self._event_thread.join(timeout=2)
 
         for browser in self.browsers:
             try:
@@ -150,6 +231,12 @@ class Discovery:
                 pass
         self.browsers.clear()
 
+        for pool in (self._emit_pool, self._scan_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._emit_pool = None
+        self._scan_pool = None
+
         if self.zeroconf is not None:
             try:
                 self.zeroconf.close()
@@ -157,6 +244,9 @@ class Discovery:
                 pass
             self.zeroconf = None
 
+        # Write out an alias save still waiting on its debounce timer
+        self.alias_mgr.flush()
+
         self._log("[DEBUG] Network discovery stopped")
 
     def reset(self) -> None:
@@ -167,13 +257,17 @@ class Discovery:
             self._seen_ips.clear()
         with self._registry_lock:
             self._registry.clear()
+        self._mdns_hit.clear()
         self._id_by_ip.clear()
-        self._web_status_prev.clear()
+        self._web_status_cache.clear()
         self.alias_mgr = DeviceAliasManager(path=None)
 
         self._cidr_thread = None
         self._port8000_thread = None
         self._sweeper_thread = None
+        self._event_thread = None
+        with self._event_lock:
+            self._event_queue.clear()
 
         self.start()
 
@@ -181,23 +275,36 @@ class Discovery:
     # mDNS callback
     # ------------------------------------------------------------------
 
-    def _on_service(
-        self, zeroconf: Zeroconf, service_type: str, name: str, state_change
-    ) -> None:
+    def _on_service(self, zeroconf: Zeroconf, service_type: str, name: str) -> None:
+        """Resolve an announced service off the Zeroconf engine thread.
+
+        ``get_service_info`` blocks until the record is answered, so it must
+        never run inside the listener callback itself.
+        """
+        pool = self._emit_pool
+        if pool is None:
+            return
+        try:
+            pool.submit(self._resolve_service, zeroconf, service_type, name)
+        except RuntimeError:
+            pass  # pool shut down by stop()
+
+    def _resolve_service(self, zeroconf: Zeroconf, service_type: str, name: str) -> None:
         try:
-            info = zeroconf.get_service_info(service_type, name, 2000)
+            info = zeroconf.get_service_info(service_type, name, 500)
             if not info:
                 return
+            server = (info.server or info.name or "").rstrip(".")
+            label = server if server else "bjorn"
+            if self.strict_bjorn_only and not self._is_bjorn_hostname(server):
+                return
             for addr in info.addresses or []:
-                try:
-                    ip = socket.inet_ntoa(addr)
-                except Exception:
-                    continue
-                server = (info.server or info.name or "").rstrip(".")
-                label = server if server else "bjorn"
-                if self.strict_bjorn_only and not self._is_bjorn_hostname(server):
-                    return
-                self._emit_device(label, ip)
+                if len(addr) != 4:
+                    continue  # IPv6 record
+                ip = socket.inet_ntoa(addr)
+                self._mdns_hit.set()
+                self._scan_wake.set()
+                self._emit_device(label, ip, self._ip_tag_int(int.from_bytes(addr, "big")))
         except Exception:
             pass
 
@@ -217,24 +324,92 @@ class Discovery:
         except Exception:
             return False
 
+    @staticmethod
+    def _probe_tcp_batch(ips: list[str], port: int, timeout: float = 0.6) -> list[str]:
+        """Return the subset of *ips* accepting TCP on *port*.
+
+        All connects are started non-blocking and multiplexed on a single
+        selector, so the whole batch costs about one *timeout* window on one
+        thread instead of one blocked thread per host.
+        """
+        in_progress = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY}
+        if hasattr(errno, "WSAEWOULDBLOCK"):
+            in_progress.add(errno.WSAEWOULDBLOCK)
+
+        sel = selectors.DefaultSelector()
+        pending: dict[socket.socket, str] = {}
+        up: list[str] = []
+        try:
+            for ip in ips:
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
+                try:
+                    err = sock.connect_ex((ip, port))
+                except OSError:
+                    sock.close()
+                    continue
+                if err == 0:
+                    up.append(ip)
+                    sock.close()
+                elif err in in_progress:
+                    sel.register(sock, selectors.EVENT_WRITE)
+                    pending[sock] = ip
+                else:
+                    sock.close()
+
+            deadline = time.monotonic() + timeout
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                for key, _ in sel.select(remaining):
+                    sock = key.fileobj
+                    ip = pending.pop(sock)
+                    sel.unregister(sock)
+                    try:
+                        if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                            up.append(ip)
+                    finally:
+                        sock.close()
+        finally:
+            for sock in pending:
+                sock.close()
+            sel.close()
+        return up
+
     # ------------------------------------------------------------------
     # Device emission
     # ------------------------------------------------------------------
 
-    def _emit_device(self, label: str, ip: str) -> None:
-        """Register a discovered device and notify the callback if new."""
+    def _emit_device(
+        self,
+        label: str,
+        ip: str,
+        tag: Optional[str] = None,
+        *,
+        resolve: bool = True,
+    ) -> None:
+        """Register a discovered device and notify the callback if new.
+
+        *tag* may be supplied by callers that already hold the packed address.
+        With *resolve* false an empty *label* is taken as final: the caller
+        already tried the PTR lookup (and it failed or timed out).
+        """
         if self._is_ignored_ip(ip):
             return
 
         with self._seen_ips_lock:
             self._seen_ips.add(ip)
 
-        host = self._normalize_host(label or self._reverse_hostname(ip))
+        if not label and resolve:
+            label = self._reverse_hostname(ip) or ""
+        host = self._normalize_host(label)
         if self.strict_bjorn_only and not self._is_bjorn_hostname(host):
             return
 
         device_key = self._device_key(host, ip)
-        tag = self._ip_tag(ip)
+        if tag is None:
+            tag = self._ip_tag(ip)
 
         # Persistent alias by device_key (same number on USB/LAN)
         base_alias = self.alias_mgr.alias_for(device_key)
@@ -257,58 +432,56 @@ class Discovery:
 
             rec["last_seen"] = now
 
-        # Only emit for genuinely new entries (device or new IP)
+        # Only emit for genuinely new entries (device or new IP).  The webapp
+        # probe runs on the emit pool so scan/mDNS threads are not stalled.
         if is_new_device or is_new_ip_for_device:
-            has_webapp = self._probe_tcp(ip, 8000, timeout=0.35)
-            if self.api_callback:
-                self.api_callback("device_found", alias, ip, has_webapp)
+            pool = self._emit_pool
+            if pool is None:
+                self._finish_emit(alias, ip)
+                return
+            try:
+                pool.submit(self._finish_emit, alias, ip)
+            except RuntimeError:
+                pass  # pool shut down by stop()
+
+    def _finish_emit(self, alias: str, ip: str) -> None:
+        """Probe the webapp port for a new device and report it."""
+        has_webapp = self._probe_tcp(ip, 8000, timeout=0.35)
+        self._web_status_cache[ip] = (has_webapp, time.monotonic())
+        if not self._stop:
+            self._queue_event("device_found", alias, ip, has_webapp)
 
     # ------------------------------------------------------------------
     # CIDR scan
     # ------------------------------------------------------------------
 
     def _scan_cidr_loop(self) -> None:
-        """Scan well-known subnets and the gateway /24 for SSH (port 22)."""
+        """Scan the PAN subnets, then the gateway subnet if mDNS stays silent.
+
+        Bjorn advertises itself over mDNS, so a blind SYN sweep of the LAN is
+        only a fallback; USB/Bluetooth PAN links carry no multicast and are
+        always scanned for SSH (port 22).
+        """
         self._log("[DEBUG] CIDR scan started")
 
-        networks: list[ipaddress.IPv4Network] = []
-        try:
-            gw_net = self._get_gateway_cidr()
-            if gw_net:
-                networks.append(gw_net)
-        except Exception:
-            pass
-        for cidr in ("172.20.1.0/24", "172.20.2.0/24"):
+        for cidr in self.PAN_CIDRS:
+            if self._stop:
+                break
             try:
-                networks.append(ipaddress.ip_network(cidr, strict=False))
+                self._scan_network(ipaddress.ip_network(cidr, strict=False))
             except Exception:
                 pass
 
-        for network in networks:
+        if not self._stop and (self.fallback_cidr or not self._wait_for_mdns()):
             if self._stop:
-                break
-            hosts = list(network.hosts())
-            q: queue.Queue[str] = queue.Queue()
-            for host in hosts:
-                q.put(str(host))
-
-            def worker() -> None:
-                while not self._stop:
-                    try:
-                        ip = q.get_nowait()
-                    except queue.Empty:
-                        break
-                    if self._probe_tcp(ip, 22, timeout=0.4):
-                        hostname = self._reverse_hostname(ip) or ""
-                        self._emit_device(hostname, ip)
-
-            threads = [
-                threading.Thread(target=worker, daemon=True) for _ in range(24)
-            ]
-            for t in threads:
-                t.start()
-            for t in threads:
-                t.join()
+                return
+            try:
+                gw_net = self._get_gateway_cidr()
+                if gw_net and not self._stop:
+                    self._log(f"[DEBUG] Scanning gateway subnet {gw_net}")
+                    self._scan_network(gw_net)
+            except Exception:
+                pass
 
         self._log("[DEBUG] CIDR scan completed")
 
@@ -319,41 +492,91 @@ class Discovery:
             )
             self._port8000_thread.start()
 
+    def _wait_for_mdns(self) -> bool:
+        """Wait up to ``MDNS_GRACE_SECONDS`` for an mDNS hit.
+
+        Returns ``True`` on a hit.  Returns ``False`` on timeout or when
+        ``stop()`` is called, so the grace window never outlives discovery.
+        """
+        if not self._mdns_hit.is_set():
+            self._scan_wake.wait(self.MDNS_GRACE_SECONDS)
+        return self._mdns_hit.is_set() and not self._stop_event.is_set()
+
+    def _scan_network(self, network: ipaddress.IPv4Network) -> None:
+        """Probe every host of *network* for SSH and emit those that answer.
+
+        Hosts are streamed from ``network.hosts()`` in ``SCAN_BATCH_SIZE``
+        slices, so memory and open sockets scale with the batch, not the
+        subnet (and stay under Windows' 512-socket ``select`` limit).
+        """
+        hosts = (addr.exploded for addr in network.hosts())
+        while not self._stop:
+            batch = list(itertools.islice(hosts, self.SCAN_BATCH_SIZE))
+            if not batch:
+                break
+            hits = self._probe_tcp_batch(batch, 22, timeout=0.4)
+            if hits:
+                self._emit_hits(hits)
+
+    def _emit_hits(self, hits: list[str]) -> None:
+        """Resolve scan hits concurrently, then emit them as devices."""
+        # A slow PTR only delays its own host.
+        pool = self._scan_pool
+        if pool is None:
+            return
+        try:
+            lookups = {ip: pool.submit(self._reverse_hostname, ip) for ip in hits}
+        except RuntimeError:
+            return  # pool shut down by stop()
+        for ip, lookup in lookups.items():
+            if self._stop:
+                break
+            try:
+                hostname = lookup.result(timeout=self.RDNS_TIMEOUT) or ""
+            except Exception:
+                hostname = ""
+            # Never retry a failed or timed-out lookup inline on this thread
+            self._emit_device(hostname, ip, resolve=False)
+
     # ------------------------------------------------------------------
     # Port 8000 webapp polling (parallel)
     # ------------------------------------------------------------------
 
     def _port8000_poll(self) -> None:
-        """Periodically probe all seen IPs for port 8000 (webapp) status.
+        """Periodically probe seen IPs for port 8000 (webapp) status.
 
-        Probes run in parallel using a thread pool (max 8 workers).
+        IPs observed within ``WEB_STATUS_MAX_AGE`` seconds are skipped, the
+        rest are probed at once through ``_probe_tcp_batch``, and
+        ``webapp_status`` is only emitted when the state changes.
         """
         while not self._stop:
             with self._seen_ips_lock:
                 ips = list(self._seen_ips)
 
+            # Skip IPs observed recently (e.g. by _emit_device's probe)
+            now = time.monotonic()
+            ips = [
+                ip for ip in ips
+                if now - self._web_status_cache.get(ip, (False, 0.0))[1]
+                >= self.WEB_STATUS_MAX_AGE
+            ]
+
             if ips:
-                with ThreadPoolExecutor(max_workers=8) as pool:
-                    futures = {
-                        pool.submit(self._probe_tcp, ip, 8000, 0.35): ip
-                        for ip in ips
-                    }
-                    for future in as_completed(futures):
-                        if self._stop:
-                            break
-                        ip = futures[future]
-                        try:
-                            up = future.result()
-                        except Exception:
-                            up = False
-                        if self.api_callback:
-                            self.api_callback("webapp_status", ip, up)
-
-            # Sleep in 1-second increments so we can exit quickly
-            for _ in range(30):
-                if self._stop:
-                    break
-                time.sleep(1)
+                up_ips = set(self._probe_tcp_batch(ips, 8000, timeout=0.35))
+                now = time.monotonic()
+                for ip in ips:
+                    if self._stop:
+                        break
+                    up = ip in up_ips
+                    prev = self._web_status_cache.get(ip)
+                    self._web_status_cache[ip] = (up, now)
+                    if prev is not None and prev[0] == up:
+                        continue
+                    self._queue_event("webapp_status", ip, up)
+
+            # Wakes immediately when stop() is called
+            if self._stop_event.wait(30):
+                break
 
     # ------------------------------------------------------------------
     # Sweeper — removes stale devices
@@ -371,8 +594,7 @@ class Discovery:
                     if now - rec["last_seen"] > self._stale_timeout:
                         for ip in rec["ips"]:
                             stale_ips.append(ip)
-                            if self.api_callback:
-                                self.api_callback("device_gone", ip)
+                            self._queue_event("device_gone", ip)
                         to_delete.append(key)
                 for key in to_delete:
                     self._registry.pop(key, None)
@@ -383,12 +605,33 @@ class Discovery:
                         self._seen_ips.discard(ip)
                 for ip in stale_ips:
                     self._id_by_ip.pop(ip, None)
-                    self._web_status_prev.pop(ip, None)
+                    self._web_status_cache.pop(ip, None)
 
-            for _ in range(5):
-                if self._stop:
-                    break
-                time.sleep(1)
+            if self._stop_event.wait(5):
+                break
+
+    # ------------------------------------------------------------------
+    # Event batching
+    # ------------------------------------------------------------------
+
+    def _queue_event(self, event_type: str, *args) -> None:
+        """Buffer a device event for the next ``events_batch`` callback."""
+        with self._event_lock:
+            self._event_queue.append((event_type, *args))
+
+    def _flush_events(self) -> None:
+        with self._event_lock:
+            events, self._event_queue = self._event_queue, []
+        if events and self.api_callback:
+            try:
+                self.api_callback("events_batch", events)
+            except Exception:
+                pass
+
+    def _event_flush_loop(self) -> None:
+        """Deliver buffered device events once per ``EVENT_FLUSH_INTERVAL``."""
+        while not self._stop_event.wait(self.EVENT_FLUSH_INTERVAL):
+            self._flush_events()
 
     # ------------------------------------------------------------------
     # Helpers
@@ -397,9 +640,19 @@ class Discovery:
     @staticmethod
     def _ip_tag(ip: str) -> str:
         """Return a human-readable interface tag for the given IP."""
-        if ip.startswith("172.20.2."):
+        try:
+            ip_int = int.from_bytes(socket.inet_aton(ip), "big")
+        except OSError:
+            return "LAN"
+        return Discovery._ip_tag_int(ip_int)
+
+    @staticmethod
+    def _ip_tag_int(ip_int: int) -> str:
+        """Classify a 32-bit IPv4 address by its /24 with a single mask."""
+        net = ip_int & 0xFFFFFF00
+        if net == 0xAC140200:  # 172.20.2.0/24
             return "USB"
-        if ip.startswith("172.20.1."):
+        if net == 0xAC140100:  # 172.20.1.0/24
             return "Bluetooth"
         return "LAN"
 
@@ -415,11 +668,13 @@ class Discovery:
             h = h[:-5]
         return h
 
-    def _device_key(self, label: str, ip: str) -> str:
-        """Compute a stable key for a device (hostname preferred, IP fallback)."""
-        host = self._normalize_host(label or self._reverse_hostname(ip))
-        if self._is_bjorn_hostname(host):
-            return host
+    def _device_key(self, normalized_host: str, ip: str) -> str:
+        """Compute a stable key for a device (hostname preferred, IP fallback).
+
+        *normalized_host* must already have gone through ``_normalize_host``.
+        """
+        if self._is_bjorn_hostname(normalized_host):
+            return normalized_host
         return ip
 
     @staticmethod
@@ -427,27 +682,25 @@ class Discovery:
         """Return ``True`` if *host_or_fullname* looks like a Bjorn device."""
         if not host_or_fullname:
             return False
-        s = host_or_fullname.strip().lower().rstrip(".")
-        if s in ("bjorn.local", "bjorn.home"):
-            return True
-        if s.startswith("bjorn") and (s.endswith(".local") or s.endswith(".home")):
-            return True
-        return s == "bjorn" or s.startswith("bjorn-") or s.startswith("bjorn_")
+        return _BJORN_HOST_RE.match(host_or_fullname.strip().lower().rstrip(".")) is not None
 
-    @staticmethod
-    def _reverse_hostname(ip: str) -> Optional[str]:
-        """Attempt a reverse DNS lookup for *ip*."""
+    def _reverse_hostname(self, ip: str) -> Optional[str]:
+        """Attempt a reverse DNS lookup for *ip* (successes memoised per run)."""
+        host = self._rdns_cache.get(ip)
+        if host is not None:
+            return host
         try:
             host, _, _ = socket.gethostbyaddr(ip)
-            return host.strip().lower()
         except Exception:
             return None
+        host = host.strip().lower()
+        self._rdns_cache[ip] = host
+        return host
 
-    @staticmethod
-    def _get_gateway_cidr() -> Optional[ipaddress.IPv4Network]:
+    def _get_gateway_cidr(self) -> Optional[ipaddress.IPv4Network]:
         """Return the /24 network of the default gateway, or ``None``."""
         try:
-            gws = netifaces.gateways()
+            gws = self._gateways
             default_gw = gws.get("default")
             if default_gw and netifaces.AF_INET in default_gw:
                 _gw_ip, iface = default_gw[netifaces.AF_INET]
@@ -465,31 +718,32 @@ class Discovery:
 
         This includes gateway/router IPs and the machine's own addresses.
         """
+        ignored: set[str] = set()
         try:
-            gws = netifaces.gateways()
+            gws = self._gateways
             default_gw = gws.get("default")
             if default_gw and netifaces.AF_INET in default_gw:
                 gw_ip, _ = default_gw[netifaces.AF_INET]
-                self._ignored_ips.add(gw_ip)
+                ignored.add(gw_ip)
             # Also add all non-default gateways
             for gw_list in gws.values():
                 if isinstance(gw_list, list):
                     for entry in gw_list:
                         if isinstance(entry, tuple) and len(entry) >= 1:
-                            self._ignored_ips.add(entry[0])
+                            ignored.add(entry[0])
         except Exception:
             pass
         # Common router IPs that are never a Bjorn
-        for common in ("192.168.1.1", "192.168.0.1", "192.168.1.254", "10.0.0.1"):
-            self._ignored_ips.add(common)
+        ignored.update(("192.168.1.1", "192.168.0.1", "192.168.1.254", "10.0.0.1"))
         # Own IPs — this machine is not a Bjorn target
         try:
             for iface_name in netifaces.interfaces():
                 addrs = netifaces.ifaddresses(iface_name).get(netifaces.AF_INET, [])
                 for addr in addrs:
-                    self._ignored_ips.add(addr.get("addr", ""))
+                    ignored.add(addr.get("addr", ""))
         except Exception:
             pass
+        self._ignored_ips = frozenset(ignored)
 
     def _is_ignored_ip(self, ip: str) -> bool:
         """Return True if *ip* should be silently skipped."""
@@ -2,16 +2,89 @@
 
 The generator produces a custom orchestrator that ``source``s the modular
 ``lib/*.sh`` modules already present on the device (uploaded by the SSH worker).
-User-provided snippets are appended as extra steps.
+When the local ``lib/`` directory is passed in, its modules are inlined
+instead so the script is self-contained.  User-provided snippets are
+appended as extra steps.
 """
 
+import functools
+import hashlib
+import json
 import os
 import re
+import shlex
 import stat
+import string
 import tempfile
-import time
+import threading
+from collections import OrderedDict
 from typing import Dict, List, Optional
 
+from bjorn_manager.installer.validator import ScriptValidator
+
+# Sanitation pattern for snippet names, compiled once at import.
+_SAFE_RE = re.compile(r"[^A-Za-z0-9_\-. ]+")
+
+# (config key, default, bash lines) applied in order by
+# ``ScriptGenerator._generate_system_configs``.
+_SYSCONFIG_RULES = (
+    ("enable_spi", True, (
+        'log "INFO" "Enabling SPI interface..."',
+        'raspi-config nonint do_spi 0 >> "$LOG_FILE" 2>&1 '
+        '|| log "WARNING" "raspi-config SPI failed"',
+    )),
+    ("enable_i2c", True, (
+        'log "INFO" "Enabling I2C interface..."',
+        'raspi-config nonint do_i2c 0 >> "$LOG_FILE" 2>&1 '
+        '|| log "WARNING" "raspi-config I2C failed"',
+    )),
+    ("enable_bluetooth", True, (
+        'log "INFO" "Enabling Bluetooth..."',
+        'systemctl enable bluetooth >> "$LOG_FILE" 2>&1 || true',
+        'systemctl start bluetooth >> "$LOG_FILE" 2>&1 || true',
+    )),
+    ("enable_usb_gadget", True, (
+        'log "INFO" "Configuring USB Gadget..."',
+        'echo "dtoverlay=dwc2" >> /boot/firmware/config.txt',
+        'sed -i "s/rootwait/& modules-load=dwc2,g_ether/" '
+        "/boot/firmware/cmdline.txt",
+    )),
+    ("configure_wifi", True, (
+        'log "INFO" "Configuring WiFi (preconfigured file if present)..."',
+        "# TODO: apply /etc/NetworkManager/system-connections/"
+        "preconfigured.nmconnection if exists",
+    )),
+    ("set_limits", True, (
+        'log "INFO" "Setting system limits..."',
+        'echo "* soft nofile 65535" >> /etc/security/limits.conf',
+        'echo "* hard nofile 65535" >> /etc/security/limits.conf',
+    )),
+)
+
+# Bash frame around each user snippet body (see ``_build_snippets_block``).
+_SNIPPET_HEAD = (
+    'announce_step %d "Executing user snippet: %s"\n'
+    'USER_SNIPPET_FILE="/tmp/bjorn_user_snippet_%d.sh"\n'
+    "cat << 'USERSNIPPET_%d' > \"$USER_SNIPPET_FILE\""
+)
+_SNIPPET_TAIL = (
+    "USERSNIPPET_%d\n"
+    'chmod +x "$USER_SNIPPET_FILE"\n'
+    'if [ -s "$USER_SNIPPET_FILE" ]; then\n'
+    '    bash "$USER_SNIPPET_FILE" 2>&1 | tee -a "$LOG_FILE" '
+    "|| log \"ERROR\" \"User snippet '%s' returned non-zero\"\n"
+    "    log \"INFO\" \"User snippet '%s' completed\"\n"
+    "else\n"
+    "    log \"WARNING\" \"User snippet '%s' is empty\"\n"
+    "fi\n"
+    'rm -f "$USER_SNIPPET_FILE"'
+)
+
+# Generated scripts keyed by configuration digest (most recent last).
+_SCRIPT_CACHE_SIZE = 32
+_script_cache: "OrderedDict[str, str]" = OrderedDict()
+_script_cache_lock = threading.Lock()
+
 
 class ScriptGenerator:
     """Build a custom bash installer orchestrator from an advanced-config dict."""
@@ -21,7 +94,9 @@ class ScriptGenerator:
     # ------------------------------------------------------------------
 
     @staticmethod
-    def generate(config: dict, *, git_branch: str = "main") -> str:
+    def generate(
+        config: dict, *, git_branch: str = "main", lib_dir: Optional[str] = None
+    ) -> str:
         """Generate a custom installation shell script from *config*.
 
         Parameters
@@ -46,11 +121,25 @@ class ScriptGenerator:
         git_branch:
             The branch (or tag) to ``git clone``.  Defaults to ``"main"``.
 
+        lib_dir:
+            Local directory holding the ``lib/*.sh`` modules.  When given and
+            non-empty, the modules are inlined into the script; otherwise
+            the script sources ``lib/`` next to itself on the device, with
+            minimal fallbacks.
+
         Returns
         -------
         str
-            Absolute path to the generated temporary ``.sh`` file.
+            Absolute path to the generated temporary ``.sh`` file.  An
+            identical *config* / *git_branch* / lib contents combination
+            returns the previously written file for as long as it exists.
         """
+        lib_modules = _lib_modules(lib_dir)
+        digest = _config_digest(config, git_branch, lib_modules)
+        cached = _cached_script(digest)
+        if cached:
+            return cached
+
         extra_apt_list = _split_packages(config.get("extra_apt", ""))
         extra_pip_list = _split_packages(config.get("extra_pip", ""))
 
@@ -76,8 +165,9 @@ class ScriptGenerator:
         if operation_mode not in {"auto", "manual", "ai"}:
             operation_mode = "manual" if config.get("manual_mode", True) else "ai"
 
-        script_content = _SCRIPT_TEMPLATE.format(
-            timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
+        script_content = _render_template(dict(
+            config_id=digest,
+            lib_block=_inline_lib(lib_modules) if lib_modules else _LIB_SOURCE_BLOCK,
             total_steps=total_steps,
             epd_version=config.get("epd_version", "epd2in13_V4"),
             operation_mode=operation_mode,
@@ -85,16 +175,18 @@ class ScriptGenerator:
             bluetooth_mac=config.get("bluetooth_mac", "60:57:C8:47:E3:88"),
             webui_auth="true" if config.get("webui_auth", False) else "false",
             webui_password=config.get("webui_password", ""),
-            apt_packages=" ".join(f'"{p}"' for p in apt_pkgs),
-            pip_packages=" ".join(f'"{p}"' for p in pip_pkgs),
-            extra_apt_packages=" ".join(f'"{p}"' for p in extra_apt_list),
-            extra_pip_packages=" ".join(f'"{p}"' for p in extra_pip_list),
+            apt_packages=_quote_pkgs(tuple(map(str, apt_pkgs))),
+            pip_packages=_quote_pkgs(tuple(map(str, pip_pkgs))),
+            extra_apt_packages=_quote_pkgs(tuple(extra_apt_list)),
+            extra_pip_packages=_quote_pkgs(tuple(extra_pip_list)),
             system_configs=system_configs,
             snippets_block=snippets_block,
             git_branch=git_branch,
-        )
+        ))
 
-        return _save_temp_script(script_content)
+        path = _save_temp_script(script_content)
+        _remember_script(digest, path)
+        return path
 
     # ------------------------------------------------------------------
     # System configuration commands
@@ -113,60 +205,12 @@ class ScriptGenerator:
         * ``configure_wifi``
         * ``set_limits``
         """
-        commands: List[str] = []
-
-        if configs.get("enable_spi", True):
-            commands.append('log "INFO" "Enabling SPI interface..."')
-            commands.append(
-                'raspi-config nonint do_spi 0 >> "$LOG_FILE" 2>&1 '
-                '|| log "WARNING" "raspi-config SPI failed"'
-            )
-
-        if configs.get("enable_i2c", True):
-            commands.append('log "INFO" "Enabling I2C interface..."')
-            commands.append(
-                'raspi-config nonint do_i2c 0 >> "$LOG_FILE" 2>&1 '
-                '|| log "WARNING" "raspi-config I2C failed"'
-            )
-
-        if configs.get("enable_bluetooth", True):
-            commands.append('log "INFO" "Enabling Bluetooth..."')
-            commands.append(
-                'systemctl enable bluetooth >> "$LOG_FILE" 2>&1 || true'
-            )
-            commands.append(
-                'systemctl start bluetooth >> "$LOG_FILE" 2>&1 || true'
-            )
-
-        if configs.get("enable_usb_gadget", True):
-            commands.append('log "INFO" "Configuring USB Gadget..."')
-            commands.append(
-                'echo "dtoverlay=dwc2" >> /boot/firmware/config.txt'
-            )
-            commands.append(
-                'sed -i "s/rootwait/& modules-load=dwc2,g_ether/" '
-                "/boot/firmware/cmdline.txt"
-            )
-
-        if configs.get("configure_wifi", True):
-            commands.append(
-                'log "INFO" "Configuring WiFi (preconfigured file if present)..."'
-            )
-            commands.append(
-                "# TODO: apply /etc/NetworkManager/system-connections/"
-                "preconfigured.nmconnection if exists"
-            )
-
-        if configs.get("set_limits", True):
-            commands.append('log "INFO" "Setting system limits..."')
-            commands.append(
-                'echo "* soft nofile 65535" >> /etc/security/limits.conf'
-            )
-            commands.append(
-                'echo "* hard nofile 65535" >> /etc/security/limits.conf'
-            )
-
-        return "\n".join(commands)
+        return "\n".join(
+            line
+            for key, default, lines in _SYSCONFIG_RULES
+            if configs.get(key, default)
+            for line in lines
+        )
 
     # ------------------------------------------------------------------
     # Helpers
@@ -175,16 +219,21 @@ class ScriptGenerator:
     @staticmethod
     def _safe_name(n: str) -> str:
         """Sanitise a user-provided snippet name for use in filenames."""
-        return (
-            re.sub(r"[^A-Za-z0-9_\-\. ]+", "_", (n or "snippet").strip())
-            or "snippet"
-        )
+        # A single compiled sub() beats a per-character translate/allow-set
+        # pass here: clean names are returned without copying, and runs of
+        # forbidden characters collapse to one "_" in the same scan.
+        return _SAFE_RE.sub("_", (n or "snippet").strip()) or "snippet"
 
     @staticmethod
     def _build_snippets_block(
         snippets: List[dict], base_steps: int
     ) -> str:
-        """Return the bash fragment that executes user-provided snippets."""
+        """Return the bash fragment that executes user-provided snippets.
+
+        The cost is dominated by the final ``join``, which copies each
+        snippet body exactly once; per-snippet Python work is two small
+        ``%`` formats and the name sanitiser.
+        """
         if not snippets:
             idx = base_steps + 1
             return (
@@ -193,33 +242,25 @@ class ScriptGenerator:
                 'log "INFO" "No user snippets to execute"\n'
             )
 
-        parts: List[str] = []
+        # Static frames are %-formatted; the snippet code stays a separate
+        # element so each body is copied only once, by the final join.
+        lines: List[str] = []
         for i, snippet in enumerate(snippets, start=1):
             idx = base_steps + i
             name = ScriptGenerator._safe_name(
                 snippet.get("name", f"snippet_{i}")
             )
-            # Escape braces so str.format() in the outer template is safe.
-            code = (snippet.get("code", "") or "").replace(
-                "{", "{{"
-            ).replace("}", "}}")
-            parts.append(
-                f'\nannounce_step {idx} "Executing user snippet: {name}"\n'
-                f'USER_SNIPPET_FILE="/tmp/bjorn_user_snippet_{i}.sh"\n'
-                f"cat << 'USERSNIPPET_{i}' > \"$USER_SNIPPET_FILE\"\n"
-                f"{code}\n"
-                f"USERSNIPPET_{i}\n"
-                f'chmod +x "$USER_SNIPPET_FILE"\n'
-                f'if [ -s "$USER_SNIPPET_FILE" ]; then\n'
-                f"    bash \"$USER_SNIPPET_FILE\" 2>&1 | tee -a \"$LOG_FILE\" "
-                f"|| log \"ERROR\" \"User snippet '{name}' returned non-zero\"\n"
-                f"    log \"INFO\" \"User snippet '{name}' completed\"\n"
-                f"else\n"
-                f"    log \"WARNING\" \"User snippet '{name}' is empty\"\n"
-                f"fi\n"
-                f'rm -f "$USER_SNIPPET_FILE"\n'
-            )
-        return "".join(parts)
+            # Substituted values are never re-parsed by the template
+            # renderer, so snippet code is emitted verbatim (no brace escape).
+            code = snippet.get("code", "") or ""
+            lines.extend((
+                "",
+                _SNIPPET_HEAD % (idx, name, i, i),
+                code,
+                _SNIPPET_TAIL % (i, name, name, name),
+            ))
+        lines.append("")
+        return "\n".join(lines)
 
 
 # ======================================================================
@@ -231,7 +272,83 @@ def _split_packages(raw: str) -> List[str]:
     """Split a whitespace-separated package string into a clean list."""
     if not raw:
         return []
-    return [tok for tok in re.split(r"[ \t\r\n]+", raw.strip()) if tok]
+    # str.split() with no separator splits on whitespace runs and drops
+    # empty tokens itself, so no regex is needed here.
+    return raw.split()
+
+
+@functools.lru_cache(maxsize=256)
+def _quote_pkgs(pkgs: tuple) -> str:
+    """Return *pkgs* as shell-quoted words for a bash array literal.
+
+    Empty names are dropped so the batch installers never see ``''``.
+    """
+    return " ".join(shlex.quote(p) for p in pkgs if p)
+
+
+def _lib_modules(lib_dir: Optional[str]) -> tuple:
+    """Return ``(path, mtime_ns, size)`` for each ``lib_dir/*.sh`` in source order.
+
+    Sorted by name, matching bash's glob order under ``LC_ALL=C.UTF-8``.
+    """
+    if not lib_dir:
+        return ()
+    try:
+        names = sorted(n for n in os.listdir(lib_dir) if n.endswith(".sh"))
+        modules = []
+        for name in names:
+            path = os.path.join(lib_dir, name)
+            st = os.stat(path)
+            modules.append((path, st.st_mtime_ns, st.st_size))
+    except OSError:
+        return ()
+    return tuple(modules)
+
+
+@functools.lru_cache(maxsize=4)
+def _inline_lib(modules: tuple) -> str:
+    """Concatenate the lib modules described by *modules* (see ``_lib_modules``).
+
+    Keyed on path, mtime and size, so an edited module is re-read.
+    """
+    parts: List[str] = []
+    for path, _mtime, _size in modules:
+        with open(path, "r", encoding="utf-8") as fh:
+            text = fh.read()
+        parts.append(f"# ── lib/{os.path.basename(path)} (inlined) ──")
+        parts.append(text.rstrip("\n"))
+    return "\n".join(parts)
+
+
+def _config_digest(config: dict, git_branch: str, lib_modules: tuple = ()) -> str:
+    """Return a stable hash of *config*, *git_branch* and the lib modules."""
+    canonical = json.dumps(
+        [config, git_branch, lib_modules], sort_keys=True, default=str
+    )
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cached_script(digest: str) -> Optional[str]:
+    """Return the cached script path for *digest* if the file still exists."""
+    with _script_cache_lock:
+        path = _script_cache.get(digest)
+        if path is None:
+            return None
+        if not os.path.isfile(path):
+            # Deleted after use (e.g. by the installer) -- regenerate.
+            del _script_cache[digest]
+            return None
+        _script_cache.move_to_end(digest)
+        return path
+
+
+def _remember_script(digest: str, path: str) -> None:
+    """Record *path* as the script generated for *digest*."""
+    with _script_cache_lock:
+        _script_cache[digest] = path
+        _script_cache.move_to_end(digest)
+        while len(_script_cache) > _SCRIPT_CACHE_SIZE:
+            _script_cache.popitem(last=False)
 
 
 def _save_temp_script(content: str) -> str:
@@ -240,15 +357,20 @@ def _save_temp_script(content: str) -> str:
     The file is created with Unix (LF) line endings and ``0755`` permissions
     on platforms that support POSIX permission bits.
     """
-    clean = content.lstrip("\ufeff")
+    clean = content[1:] if content.startswith("\ufeff") else content
+    data = memoryview(clean.encode("utf-8"))
+    # mkstemp opens the file in binary mode, so write straight to its fd.
     fd, path = tempfile.mkstemp(prefix="bjorn_advanced_", suffix=".sh")
-    os.close(fd)
-    with open(path, "w", encoding="utf-8", newline="\n") as fh:
-        fh.write(clean)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
     try:
         os.chmod(path, stat.S_IRWXU | stat.S_IRGRP | stat.S_IXGRP | stat.S_IROTH | stat.S_IXOTH)
     except OSError:
         pass  # Windows does not support full POSIX permission bits
+    ScriptValidator.trust(path)
     return path
 
 
@@ -259,12 +381,13 @@ def _save_temp_script(content: str) -> str:
 # (uploaded via SSH), then runs a custom step sequence with user overrides.
 #
 # Double braces ``{{`` / ``}}`` are literal braces in the output; single
-# braces are ``str.format()`` placeholders.
+# braces are ``str.format()``-style placeholders.  The template is parsed
+# once at import (see ``_compile_template``) rather than on every call.
 
 _SCRIPT_TEMPLATE = r"""#!/bin/bash
 # BJORN Custom Installation Script
 # Generated by BJORN Installation Manager (Advanced Config)
-# Configuration timestamp: {timestamp}
+# Configuration id: {config_id}
 export LANG=C.UTF-8
 export LC_ALL=C.UTF-8
 
@@ -272,22 +395,7 @@ export LC_ALL=C.UTF-8
 SCRIPT_DIR="$(cd "$(dirname "${{BASH_SOURCE[0]}}")" && pwd)"
 LIB_DIR="$SCRIPT_DIR/lib"
 
-if [ -d "$LIB_DIR" ]; then
-    for _mod in "$LIB_DIR"/*.sh; do source "$_mod"; done
-else
-    # Inline fallbacks when lib/ is not present (standalone custom script)
-    RED='\033[0;31m'; GREEN='\033[0;32m'; YELLOW='\033[1;33m'
-    BLUE='\033[0;34m'; NC='\033[0m'
-    LOG_FILE="/var/log/bjorn_custom_install.log"
-    mkdir -p "$(dirname "$LOG_FILE")"
-    log() {{ echo -e "[$1] $2" | tee -a "$LOG_FILE"; }}
-    BJORN_USER="bjorn"
-    PIP_BREAK_FLAG="--break-system-packages"
-    pip_install() {{
-        pip3 install $PIP_BREAK_FLAG "$@" >> "$LOG_FILE" 2>&1 || \
-        pip3 install "$@" >> "$LOG_FILE" 2>&1
-    }}
-fi
+{lib_block}
 
 TOTAL_STEPS={total_steps}
 announce_step() {{
@@ -296,6 +404,32 @@ announce_step() {{
     log "INFO" "Step $idx/$TOTAL_STEPS: $txt"
 }}
 
+# Install a package list in one transaction; on failure retry one by one
+# so the log shows which package broke the batch.
+apt_install_batch() {{
+    [ $# -eq 0 ] && return 0
+    log "INFO" "Installing $# APT package(s): $*"
+    apt-get install -y "$@" 2>&1 | tee -a "$LOG_FILE"
+    [ "${{PIPESTATUS[0]}}" -eq 0 ] && return 0
+    log "WARNING" "Batch APT install failed, retrying package by package"
+    local pkg
+    for pkg in "$@"; do
+        apt-get install -y "$pkg" 2>&1 | tee -a "$LOG_FILE"
+        [ "${{PIPESTATUS[0]}}" -eq 0 ] || log "ERROR" "Failed to install $pkg"
+    done
+}}
+
+pip_install_batch() {{
+    [ $# -eq 0 ] && return 0
+    log "INFO" "Installing $# PIP package(s): $*"
+    pip_install "$@" && return 0
+    log "WARNING" "Batch PIP install failed, retrying package by package"
+    local pkg
+    for pkg in "$@"; do
+        pip_install "$pkg" || log "ERROR" "Failed to install $pkg"
+    done
+}}
+
 # Configuration variables
 EPD_VERSION="{epd_version}"
 OPERATION_MODE="{operation_mode}"
@@ -321,37 +455,21 @@ announce_step 1 "Updating package list"
 apt-get update 2>&1 | tee -a "$LOG_FILE" || log "ERROR" "apt-get update failed"
 
 announce_step 2 "Installing base APT packages"
-for pkg in "${{APT_PACKAGES[@]}}"; do
-    [ -z "$pkg" ] && continue
-    log "INFO" "Installing $pkg..."
-    apt-get install -y "$pkg" 2>&1 | tee -a "$LOG_FILE" || log "ERROR" "Failed to install $pkg"
-done
+apt_install_batch "${{APT_PACKAGES[@]}}"
 
 announce_step 3 "Installing extra APT packages (user-defined)"
 if [ ${{#EXTRA_APT_PACKAGES[@]}} -gt 0 ]; then
-    for pkg in "${{EXTRA_APT_PACKAGES[@]}}"; do
-        [ -z "$pkg" ] && continue
-        log "INFO" "Installing $pkg..."
-        apt-get install -y "$pkg" 2>&1 | tee -a "$LOG_FILE" || log "ERROR" "Failed to install $pkg"
-    done
+    apt_install_batch "${{EXTRA_APT_PACKAGES[@]}}"
 else
     log "INFO" "No extra APT packages provided"
 fi
 
 announce_step 4 "Installing base PIP packages"
-for pkg in "${{PIP_PACKAGES[@]}}"; do
-    [ -z "$pkg" ] && continue
-    log "INFO" "Installing $pkg..."
-    pip_install "$pkg" || log "ERROR" "Failed to install $pkg"
-done
+pip_install_batch "${{PIP_PACKAGES[@]}}"
 
 announce_step 5 "Installing extra PIP packages (user-defined)"
 if [ ${{#EXTRA_PIP_PACKAGES[@]}} -gt 0 ]; then
-    for pkg in "${{EXTRA_PIP_PACKAGES[@]}}"; do
-        [ -z "$pkg" ] && continue
-        log "INFO" "Installing $pkg..."
-        pip_install "$pkg" || log "ERROR" "Failed to install $pkg"
-    done
+    pip_install_batch "${{EXTRA_PIP_PACKAGES[@]}}"
 else
     log "INFO" "No extra PIP packages provided"
 fi
@@ -365,9 +483,12 @@ if [ ! -d "Bjorn" ]; then
     git clone -b {git_branch} https://github.com/infinition/Bjorn.git 2>&1 | tee -a "$LOG_FILE" || log "ERROR" "Failed to clone repo"
 fi
 cd Bjorn
-sed -i 's/"epd_type": "epd2in13_V4"/"epd_type": "'$EPD_VERSION'"/' shared.py || true
-sed -i 's/"manual_mode": True/"manual_mode": '$MANUAL_MODE'/' shared.py || true
-grep -q '"operation_mode":' shared.py && sed -i 's/"operation_mode":[[:space:]]*"[^"]*"/"operation_mode": "'$OPERATION_MODE'"/' shared.py || true
+# Single sed pass over shared.py; expressions that do not match are no-ops.
+sed -i \
+    -e 's/"epd_type": "epd2in13_V4"/"epd_type": "'$EPD_VERSION'"/' \
+    -e 's/"manual_mode": True/"manual_mode": '$MANUAL_MODE'/' \
+    -e 's/"operation_mode":[[:space:]]*"[^"]*"/"operation_mode": "'$OPERATION_MODE'"/' \
+    shared.py || true
 if [ "$EPD_VERSION" = "epd2in13_V2" ] && grep -q '"screen_reversed":' shared.py; then
     sed -i '/"screen_reversed":/s/True\|False/False/' shared.py || true
 fi
@@ -419,3 +540,51 @@ log "SUCCESS" "BJORN installation completed!"
 echo -e "${{GREEN}}Installation completed successfully!${{NC}}"
 echo -e "${{BLUE}}Web interface will be available at: http://[device-ip]:8000${{NC}}"
 """
+
+# Default lib/ loader, used when the modules could not be inlined.  This is
+# a substituted value, not template text, so braces are literal here.
+_LIB_SOURCE_BLOCK = r"""shopt -s nullglob
+_lib_modules=("$LIB_DIR"/*.sh)
+shopt -u nullglob
+if [ ${#_lib_modules[@]} -gt 0 ]; then
+    for _mod in "${_lib_modules[@]}"; do source "$_mod"; done
+else
+    # Inline fallbacks when lib/ is not present (standalone custom script)
+    RED='\033[0;31m'; GREEN='\033[0;32m'; YELLOW='\033[1;33m'
+    BLUE='\033[0;34m'; NC='\033[0m'
+    LOG_FILE="/var/log/bjorn_custom_install.log"
+    mkdir -p "$(dirname "$LOG_FILE")"
+    log() { echo -e "[$1] $2" | tee -a "$LOG_FILE"; }
+    BJORN_USER="bjorn"
+    PIP_BREAK_FLAG="--break-system-packages"
+    pip_install() {
+        pip3 install $PIP_BREAK_FLAG "$@" >> "$LOG_FILE" 2>&1 || \
+        pip3 install "$@" >> "$LOG_FILE" 2>&1
+    }
+fi"""
+
+# The template is compiled once into a skeleton list of literal chunks with
+# an empty slot after each placeholder, plus ``(slot index, field name)``
+# pairs.  Rendering copies the skeleton, fills the slots positionally and
+# joins -- no brace scanning or per-literal work at call time.
+def _compile_template(template: str):
+    skeleton: List[str] = []
+    slots = []
+    for literal, field, _spec, _conv in string.Formatter().parse(template):
+        if literal:
+            skeleton.append(literal)
+        if field is not None:
+            slots.append((len(skeleton), field))
+            skeleton.append("")
+    return tuple(skeleton), tuple(slots)
+
+
+_TEMPLATE_SKELETON, _TEMPLATE_SLOTS = _compile_template(_SCRIPT_TEMPLATE)
+
+
+def _render_template(fields: Dict[str, object]) -> str:
+    """Substitute *fields* into the pre-compiled script template."""
+    out = list(_TEMPLATE_SKELETON)
+    for slot, field in _TEMPLATE_SLOTS:
+        out[slot] = str(fields[field])
+    return "".join(out)
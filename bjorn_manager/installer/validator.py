@@ -2,17 +2,54 @@
 
 The original code relied on ``bash -n`` and ``dos2unix``, both of which fail
 on Windows.  This module performs validation in pure Python with an optional
-``bash -n`` syntax check when running on a Unix host.
+``bash -n`` syntax check when running on a Unix host.  When the optional
+``bashlex`` package is installed, scripts it can parse are accepted without
+forking ``bash`` at all.
 """
 
+import mmap
 import os
+import stat
 import subprocess
 import sys
+import threading
+from collections import OrderedDict
+
+try:  # optional in-process bash parser; ``bash -n`` is the fallback
+    import bashlex
+except ImportError:  # pragma: no cover - depends on the environment
+    bashlex = None
+
+_UTF8_BOM = b"\xef\xbb\xbf"
+
+# Scripts written clean by this process: path -> (mtime_ns, size).  Bounded
+# so long sessions don't accumulate entries for deleted temp files.
+_TRUSTED_MAX = 64
+_trusted_paths: "OrderedDict[str, tuple]" = OrderedDict()
+_trusted_lock = threading.Lock()
 
 
 class ScriptValidator:
     """Validate shell scripts on any platform."""
 
+    @staticmethod
+    def trust(script_path: str) -> None:
+        """Mark *script_path* as known-good in its current state.
+
+        Used for scripts this process generated itself (LF endings, no BOM,
+        rendered from a checked template).  ``validate`` skips its checks for
+        the file until it is modified.
+        """
+        try:
+            st = os.stat(script_path)
+        except OSError:
+            return
+        with _trusted_lock:
+            _trusted_paths[script_path] = (st.st_mtime_ns, st.st_size)
+            _trusted_paths.move_to_end(script_path)
+            while len(_trusted_paths) > _TRUSTED_MAX:
+                _trusted_paths.popitem(last=False)
+
     @staticmethod
     def validate(script_path: str) -> bool:
         """Validate the shell script at *script_path*.
@@ -22,46 +59,77 @@ class ScriptValidator:
         2. CRLF line endings are normalised to LF (pure Python, no
            ``dos2unix`` dependency).
         3. A UTF-8 BOM is stripped if present.
-        4. On non-Windows hosts, ``bash -n`` is invoked for a syntax check
-           when ``bash`` is available.
+        4. If ``bashlex`` is installed and parses the script, it passes
+           without spawning a process.  ``bashlex`` does not cover every
+           bash construct, so a parse failure falls through to step 5.
+        5. Otherwise, on non-Windows hosts, ``bash -n`` is invoked for a
+           syntax check when ``bash`` is available.
+
+        Scripts registered with ``trust`` and unchanged since then pass
+        immediately.
 
         Returns ``True`` when the script passes all applicable checks.
         """
-        if not os.path.isfile(script_path):
+        try:
+            st = os.stat(script_path)
+        except OSError:
+            return False
+        if not stat.S_ISREG(st.st_mode):
             return False
+        with _trusted_lock:
+            if _trusted_paths.get(script_path) == (st.st_mtime_ns, st.st_size):
+                return True
 
         # ------------------------------------------------------------------
-        # 1. Read raw bytes and verify the shebang
+        # 1. Map the file read-only and verify the shebang (after an
+        #    optional BOM) without copying it into a bytes object
         # ------------------------------------------------------------------
-        with open(script_path, "rb") as fh:
-            content = fh.read()
-
-        if not content.startswith(b"#!"):
+        try:
+            with open(script_path, "rb") as fh, mmap.mmap(
+                fh.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm:
+                has_bom = mm[:3] == _UTF8_BOM
+                start = len(_UTF8_BOM) if has_bom else 0
+                if mm[start:start + 2] != b"#!":
+                    return False
+                has_crlf = mm.find(b"\r\n") != -1
+                needs_rewrite = has_bom or has_crlf
+                # Only materialise the content when something needs it.
+                content = mm[:] if needs_rewrite or bashlex is not None else b""
+        except ValueError:
+            # mmap refuses empty files -- no shebang
             return False
 
-        needs_rewrite = False
-
-        # ------------------------------------------------------------------
-        # 2. Strip BOM if present (must happen before CRLF normalisation so
-        #    we don't accidentally split a BOM across writes)
-        # ------------------------------------------------------------------
-        if content.startswith(b"\xef\xbb\xbf"):
-            content = content[3:]
-            needs_rewrite = True
+        if needs_rewrite:
+            # --------------------------------------------------------------
+            # 2. Strip BOM if present (must happen before CRLF normalisation
+            #    so we don't accidentally split a BOM across writes)
+            # --------------------------------------------------------------
+            if has_bom:
+                content = content[len(_UTF8_BOM):]
 
-        # ------------------------------------------------------------------
-        # 3. Normalise CRLF -> LF
-        # ------------------------------------------------------------------
-        if b"\r\n" in content:
-            content = content.replace(b"\r\n", b"\n")
-            needs_rewrite = True
+            # --------------------------------------------------------------
+            # 3. Normalise CRLF -> LF
+            # --------------------------------------------------------------
+            if has_crlf:
+                content = content.replace(b"\r\n", b"\n")
 
-        if needs_rewrite:
             with open(script_path, "wb") as fh:
                 fh.write(content)
 
         # ------------------------------------------------------------------
-        # 4. Syntax check via bash -n (Unix only, best-effort)
+        # 4. In-process syntax check via bashlex (optional)
+        # ------------------------------------------------------------------
+        if bashlex is not None:
+            try:
+                bashlex.parse(content.decode("utf-8", errors="replace"))
+                return True
+            except Exception:
+                # Unsupported construct or real error -- let bash decide
+                pass
+
+        # ------------------------------------------------------------------
+        # 5. Syntax check via bash -n (Unix only, best-effort)
         # ------------------------------------------------------------------
         if sys.platform != "win32":
             try:
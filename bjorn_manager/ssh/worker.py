@@ -3,9 +3,12 @@ from __future__ import annotations
 import io
 import os
 import re
+import selectors
 import shlex
+import socket
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Callable, Optional
 
@@ -14,40 +17,103 @@ import paramiko
 from bjorn_manager.ssh.config import SSHConfig
 
 STEP_PATTERN = re.compile(r"Step\s+(\d+)\s+of\s+(\d+)", re.I)
+# Byte-level twins used to scan raw installer output without decoding it
+# line by line first.
+_STEP_BYTES = re.compile(STEP_PATTERN.pattern.encode(), re.I)
+_LINE_BYTES = re.compile(rb"[^\r\n]+")
 
 _PRIVATE_KEY_NAMES = ["id_ed25519", "id_rsa", "id_ecdsa"]
 
+# Installer parameters: EPD choice number -> driver name, install mode -> flag
+_EPD_MAP = {
+    1: "epd2in13", 2: "epd2in13_V2", 3: "epd2in13_V3",
+    4: "epd2in13_V4", 5: "epd2in7",
+}
+_DEFAULT_EPD = "epd2in13_V4"
+_INSTALL_MODE_FLAGS = {"online": "-online", "local": "-local", "debug": "-debug"}
+
+# Local read buffer for binary uploads: putfo's 32 KiB reads are served
+# from memory and the disk sees one read per MiB.
+LOCAL_READ_BUFFER = 1024 * 1024
+
+# Receive window and packet size for every channel opened on the transport
+# (paramiko defaults: 2 MiB / 32 KiB).  A larger window keeps more pipelined
+# SFTP writes and command output in flight per round trip.
+CHANNEL_WINDOW_SIZE = 4 * 1024 * 1024
+CHANNEL_MAX_PACKET_SIZE = 32 * 1024
+
+# Concurrent SFTP sessions (channels on the one transport) for lib/ uploads;
+# stays well under OpenSSH's default MaxSessions of 10.
+LIB_UPLOAD_WORKERS = 4
+
+# Longest a log stream blocks waiting for data before re-checking its stop
+# event; bounds how long stop_log_stream takes to take effect.
+LOG_STREAM_STOP_POLL = 0.5
+
+# Persistent root shell used by _sudo_exec.  Input up to the ready marker
+# is discarded, which swallows the password line when sudo did not need
+# it (NOPASSWD) so it is never run as a command.
+_SUDO_READY = "__BJORN_SUDO_READY__"
+_SUDO_DONE = "__BJORN_SUDO_DONE__"
+_SUDO_SHELL_COMMAND = "sudo -S -p '' bash -c " + shlex.quote(
+    f'while IFS= read -r _l; do [ "$_l" = {_SUDO_READY} ] && break; done; exec bash'
+)
+_SUDO_OUT_DONE_RE = re.compile(rb"\n" + _SUDO_DONE.encode() + rb"(\d+)\n")
+_SUDO_ERR_DONE = b"\n" + _SUDO_DONE.encode() + b"\n"
+
+# Debug-mode deploy, run as root: one python3 process extracts Bjorn.zip,
+# picks the Bjorn source dir, swaps it in (keeping one backup) and fixes
+# ownership and modes, instead of a fork per unzip/ls/head/mv/chown/chmod.
 _DEPLOY_SCRIPT = r"""#!/bin/bash
 set -e
 cd /home/bjorn
-rm -rf Bjorn.tmp
-mkdir -p Bjorn.tmp
-
-if command -v unzip >/dev/null 2>&1; then
-    unzip -o Bjorn.zip -d Bjorn.tmp
-else
-    python3 - <<'PY'
+python3 - <<'PY'
+import grp
+import os
+import pwd
+import shutil
 import zipfile
-z = zipfile.ZipFile('Bjorn.zip')
-z.extractall('Bjorn.tmp')
+
+shutil.rmtree("Bjorn.tmp", ignore_errors=True)
+with zipfile.ZipFile("Bjorn.zip") as z:
+    z.extractall("Bjorn.tmp")
+
+# <top>/Bjorn (GitHub archive layout), then Bjorn/, else the whole archive
+candidates = [os.path.join("Bjorn.tmp", top, "Bjorn") for top in sorted(os.listdir("Bjorn.tmp"))]
+candidates.append(os.path.join("Bjorn.tmp", "Bjorn"))
+source = next((c for c in candidates if os.path.isdir(c)), "Bjorn.tmp")
+
+shutil.rmtree("Bjorn.bak", ignore_errors=True)
+try:
+    os.rename("Bjorn", "Bjorn.bak")
+except OSError:
+    pass
+os.rename(source, "Bjorn")
+shutil.rmtree("Bjorn.tmp", ignore_errors=True)
+
+try:
+    uid, gid = pwd.getpwnam("bjorn").pw_uid, grp.getgrnam("bjorn").gr_gid
+except KeyError:
+    uid = gid = -1
+
+
+def fix_owner_and_mode(path):
+    try:
+        if uid != -1:
+            os.chown(path, uid, gid, follow_symlinks=False)
+        if not os.path.islink(path):
+            os.chmod(path, 0o755)
+    except OSError:
+        pass
+
+fix_owner_and_mode("Bjorn")
+for root, dirs, files in os.walk("Bjorn"):
+    for name in dirs + files:
+        fix_owner_and_mode(os.path.join(root, name))
+
+os.remove("Bjorn.zip")
+print("Deploy complete")
 PY
-fi
-
-TOP=$(ls Bjorn.tmp | head -n1)
-if [ -d "Bjorn.tmp/$TOP/Bjorn" ]; then
-    sudo mv "Bjorn.tmp/$TOP/Bjorn" Bjorn.new
-elif [ -d "Bjorn.tmp/Bjorn" ]; then
-    sudo mv "Bjorn.tmp/Bjorn" Bjorn.new
-else
-    sudo mv Bjorn.tmp Bjorn.new
-fi
-
-sudo rm -rf Bjorn.bak && mv -f Bjorn Bjorn.bak 2>/dev/null || true
-sudo mv -f Bjorn.new Bjorn
-chown -R bjorn:bjorn /home/bjorn/Bjorn || true
-chmod -R 755 /home/bjorn/Bjorn || true
-rm -f Bjorn.zip
-echo "Deploy complete"
 """
 
 
@@ -77,9 +143,28 @@ class SSHWorker:
         self._config = config
         self._callback = callback
         self._client: Optional[paramiko.SSHClient] = None
+        # Reused across connect/close cycles; close() only drops its transport.
+        self._ssh_client = paramiko.SSHClient()
+        self._ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self._key_path: Optional[str] = None
+        self._key_path_resolved = False
         self._connected = False
+        self._sudo_shell: Optional[paramiko.Channel] = None
+        self._sudo_shell_failed = False
+        self._sudo_lock = threading.Lock()
+        # Serialises connect() and the probe-then-reconnect in
+        # _ensure_connected; monitor, log stream and action threads share
+        # the client.  Re-entrant because _ensure_connected calls connect().
+        self._connect_lock = threading.RLock()
 
     def _resolve_key_path(self) -> Optional[str]:
+        """Return the private key to try, probing the filesystem only once."""
+        if not self._key_path_resolved:
+            self._key_path = self._find_key_path()
+            self._key_path_resolved = True
+        return self._key_path
+
+    def _find_key_path(self) -> Optional[str]:
         if self._config.key_path:
             expanded = os.path.expanduser(os.path.expandvars(self._config.key_path))
             if os.path.isfile(expanded):
@@ -95,14 +180,21 @@ class SSHWorker:
     def log(self, message: str, level: str = "info") -> None:
         self._callback("log", message, level)
 
+    def log_lines(self, lines: list[str], level: str = "info") -> None:
+        """Hand several log lines to the UI in one callback."""
+        if lines:
+            self._callback("log_batch", lines, level)
+
     def update_progress(self, current: int, total: int, text: str) -> None:
         self._callback("progress", current, total, text)
 
     def connect(self) -> bool:
-        try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        with self._connect_lock:
+            return self._connect_locked()
 
+    def _connect_locked(self) -> bool:
+        try:
+            client = self._ssh_client
             key_path = self._resolve_key_path()
             connect_kwargs: dict = {
                 "hostname": self._config.host,
@@ -111,6 +203,8 @@ class SSHWorker:
                 "timeout": 15,
                 "allow_agent": False,
                 "look_for_keys": False,
+                # zlib on the Pi's CPU costs more than it saves on a LAN
+                "compress": False,
             }
 
             connected = False
@@ -126,7 +220,10 @@ class SSHWorker:
                     paramiko.AuthenticationException,
                     paramiko.SSHException,
                     FileNotFoundError,
-                ):
+                ) as exc:
+                    if isinstance(exc, FileNotFoundError):
+                        # Key vanished since it was resolved; probe again next time
+                        self._key_path_resolved = False
                     self.log("[SSH] Key auth failed, falling back to password", "warning")
                     connect_kwargs.pop("key_filename", None)
                     connect_kwargs.pop("passphrase", None)
@@ -142,9 +239,13 @@ class SSHWorker:
             transport = client.get_transport()
             if transport:
                 transport.set_keepalive(30)
+                # Applies to channels opened from here on (exec, sftp, shell)
+                transport.default_window_size = CHANNEL_WINDOW_SIZE
+                transport.default_max_packet_size = CHANNEL_MAX_PACKET_SIZE
 
             self._client = client
             self._connected = True
+            self._sudo_shell_failed = False
             return True
         except Exception as exc:
             self.log(f"[SSH] Connection failed: {exc}", "error")
@@ -153,6 +254,7 @@ class SSHWorker:
 
     def close(self) -> None:
         self._connected = False
+        self._close_sudo_shell()
         if self._client:
             try:
                 self._client.close()
@@ -162,10 +264,39 @@ class SSHWorker:
                 self._client = None
         self.log("[SSH] Disconnected.", "warning")
 
-    def _ensure_connected(self) -> paramiko.SSHClient:
+    def _transport_alive(self) -> bool:
+        """Cheap liveness probe: an SSH_MSG_IGNORE on the existing transport."""
         if self._client is None:
-            raise RuntimeError("SSH client is not connected")
-        return self._client
+            return False
+        transport = self._client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+        except Exception:
+            return False
+        return True
+
+    def _ensure_connected(self) -> paramiko.SSHClient:
+        """Return the shared client, re-authenticating once if the transport died.
+
+        Every remote call multiplexes a new channel over this single
+        authenticated transport instead of opening a new SSH connection.
+        """
+        with self._connect_lock:
+            if self._client is None:
+                raise RuntimeError("SSH client is not connected")
+            if not self._transport_alive():
+                self.log("[SSH] Transport lost, reconnecting...", "warning")
+                try:
+                    self._client.close()
+                except Exception:
+                    pass
+                self._client = None
+                self._connected = False
+                if not self.connect():
+                    raise RuntimeError("SSH client is not connected")
+            return self._client
 
     def exec_simple(
         self,
@@ -173,26 +304,148 @@ class SSHWorker:
         input_data: Optional[str] = None,
         timeout: int = 30,
     ) -> tuple[int, str, str]:
+        exit_code, out, err = self._exec_raw(command, input_data, timeout)
+        return (
+            exit_code,
+            out.decode("utf-8", errors="replace"),
+            err.decode("utf-8", errors="replace"),
+        )
+
+    def _exec_raw(
+        self,
+        command: str,
+        input_data: Optional[str] = None,
+        timeout: int = 30,
+    ) -> tuple[int, bytes, bytes]:
+        """Like ``exec_simple`` but return stdout/stderr undecoded.
+
+        Both streams are drained while the command runs.  Waiting for the
+        exit status first would let a chatty command fill the channel window
+        and stall until someone reads it.
+        """
         client = self._ensure_connected()
-        stdin, stdout, stderr = client.exec_command(command, timeout=timeout)
+        stdin, stdout, _ = client.exec_command(command, timeout=timeout)
+        channel = stdout.channel
         if input_data is not None:
             stdin.write(input_data)
             stdin.flush()
-            stdin.channel.shutdown_write()
-        exit_code = stdout.channel.recv_exit_status()
-        out = stdout.read().decode("utf-8", errors="replace")
-        err = stderr.read().decode("utf-8", errors="replace")
-        return exit_code, out, err
+            channel.shutdown_write()
+        out, err = bytearray(), bytearray()
+        selector = selectors.DefaultSelector()
+        # fileno() wakes on stdout and stderr data alike
+        selector.register(channel, selectors.EVENT_READ)
+        try:
+            while True:
+                while channel.recv_ready():
+                    out.extend(channel.recv(32768))
+                while channel.recv_stderr_ready():
+                    err.extend(channel.recv_stderr(32768))
+                if channel.eof_received or channel.exit_status_ready():
+                    break
+                selector.select(1.0)
+        finally:
+            selector.close()
+        exit_code = channel.recv_exit_status()
+        # Anything that arrived between the last drain and EOF
+        while channel.recv_ready():
+            out.extend(channel.recv(32768))
+        while channel.recv_stderr_ready():
+            err.extend(channel.recv_stderr(32768))
+        return exit_code, bytes(out), bytes(err)
 
     def _sudo_exec(
         self,
         command: str,
         timeout: int = 30,
     ) -> tuple[int, str, str]:
+        """Run *command* as root.
+
+        Commands go through one long-lived ``sudo bash`` channel, so a chain
+        of calls pays for a single channel open and sudo authentication.  If
+        that shell cannot be used (sudo refused, channel died), the command
+        falls back to a one-off ``sudo -S`` exec, which also surfaces the
+        real error.  Current callers (rm, systemctl restart) are idempotent,
+        so a retry after a shell that died mid-command is harmless.
+        """
+        with self._sudo_lock:
+            if not self._sudo_shell_failed:
+                try:
+                    return self._sudo_shell_exec(command, timeout)
+                except socket.timeout:
+                    raise
+                except (EOFError, OSError, paramiko.SSHException):
+                    # Don't retry the shell on every call for this connection
+                    self._close_sudo_shell()
+                    self._sudo_shell_failed = True
         password = self._config.sudo_password or self._config.password or ""
         sudo_cmd = f"sudo -S {command}"
         return self.exec_simple(sudo_cmd, input_data=password + "\n", timeout=timeout)
 
+    def _open_sudo_shell(self) -> paramiko.Channel:
+        shell = self._sudo_shell
+        if shell is not None and not shell.closed and not shell.exit_status_ready():
+            return shell
+        self._close_sudo_shell()
+        client = self._ensure_connected()
+        shell = client.get_transport().open_session()
+        shell.exec_command(_SUDO_SHELL_COMMAND)
+        password = self._config.sudo_password or self._config.password or ""
+        shell.sendall(f"{password}\n{_SUDO_READY}\n".encode("utf-8"))
+        self._sudo_shell = shell
+        return shell
+
+    def _close_sudo_shell(self) -> None:
+        shell, self._sudo_shell = self._sudo_shell, None
+        if shell is not None:
+            try:
+                shell.close()
+            except Exception:
+                pass
+
+    def _sudo_shell_exec(self, command: str, timeout: int) -> tuple[int, str, str]:
+        """Run *command* in the persistent root shell (caller holds the lock).
+
+        Each command runs in a subshell with stdin from /dev/null (so it can
+        neither exit the shell nor eat the next command), followed by an
+        end marker on stdout carrying ``$?`` and one on stderr.
+        """
+        shell = self._open_sudo_shell()
+        shell.sendall(
+            (
+                f"( {command}\n) </dev/null\n"
+                f"printf '\\n{_SUDO_DONE}%s\\n' \"$?\"\n"
+                f"printf '\\n{_SUDO_DONE}\\n' >&2\n"
+            ).encode("utf-8")
+        )
+        out, err = bytearray(), bytearray()
+        deadline = time.monotonic() + timeout
+        selector = selectors.DefaultSelector()
+        selector.register(shell, selectors.EVENT_READ)
+        try:
+            while True:
+                while shell.recv_ready():
+                    out.extend(shell.recv(32768))
+                while shell.recv_stderr_ready():
+                    err.extend(shell.recv_stderr(32768))
+                m = _SUDO_OUT_DONE_RE.search(out)
+                err_end = err.find(_SUDO_ERR_DONE)
+                if m and err_end != -1:
+                    return (
+                        int(m.group(1)),
+                        out[:m.start()].decode("utf-8", errors="replace"),
+                        err[:err_end].decode("utf-8", errors="replace"),
+                    )
+                if shell.closed or shell.exit_status_ready():
+                    raise EOFError("sudo shell exited")
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    # The shell is stuck in the command; do not reuse it.
+                    self._close_sudo_shell()
+                    raise socket.timeout(f"sudo command timed out after {timeout}s")
+                selector.select(min(remaining, 1.0))
+        finally:
+            selector.close()
+
     def upload_file(self, local_path: str, remote_path: str) -> None:
         client = self._ensure_connected()
         sftp = client.open_sftp()
@@ -202,7 +455,23 @@ class SSHWorker:
             if local_path.endswith((".sh", ".py", ".conf", ".cfg", ".txt", ".json", ".service")):
                 _upload_text_lf(sftp, local_path, remote_path)
             else:
-                sftp.put(local_path, remote_path)
+                with open(local_path, "rb", buffering=LOCAL_READ_BUFFER) as src:
+                    sftp.putfo(src, remote_path)
+            self.log("[SFTP] Upload complete.", "success")
+        finally:
+            sftp.close()
+
+    def upload_fileobj(self, src, remote_path: str, name: str) -> None:
+        """Stream the binary file object *src* to *remote_path* as-is.
+
+        *name* is only used for the log line.  Unlike ``upload_file`` there
+        is no local file, so the data can be produced while it uploads.
+        """
+        client = self._ensure_connected()
+        sftp = client.open_sftp()
+        try:
+            self.log(f"[SFTP] Upload {name} → {remote_path}")
+            sftp.putfo(src, remote_path)
             self.log("[SFTP] Upload complete.", "success")
         finally:
             sftp.close()
@@ -210,38 +479,30 @@ class SSHWorker:
     def deploy_bjorn_zip(self, local_zip_path: str) -> bool:
         """Deploy Bjorn.zip for debug mode to /home/bjorn/Bjorn."""
         try:
-            remote_zip = "/home/bjorn/Bjorn.zip"
-            # Zip is binary — use raw sftp.put via direct SFTP (bypass upload_file text conversion)
-            client = self._ensure_connected()
-            sftp = client.open_sftp()
-            try:
-                self.log(f"[SFTP] Upload {os.path.basename(local_zip_path)} → {remote_zip}")
-                sftp.put(local_zip_path, remote_zip)
-                self.log("[SFTP] Upload complete.", "success")
-            finally:
-                sftp.close()
+            with open(local_zip_path, "rb", buffering=LOCAL_READ_BUFFER) as src:
+                return self.deploy_bjorn_zip_stream(src, os.path.basename(local_zip_path))
+        except OSError as exc:
+            self.log(f"[DEPLOY] Failed: {exc}", "error")
+            return False
 
-            self.log("[RUN] Extracting Bjorn.zip to /home/bjorn/Bjorn ...", "info")
+    def deploy_bjorn_zip_stream(self, src, name: str = "Bjorn.zip") -> bool:
+        """Deploy a Bjorn.zip read from the binary file object *src*."""
+        try:
+            # Zip is binary — stream it raw via direct SFTP (no text conversion)
+            self.upload_fileobj(src, "/home/bjorn/Bjorn.zip", name)
 
-            # Upload and run deploy script (convert CRLF just in case)
-            client = self._ensure_connected()
-            sftp = client.open_sftp()
-            remote_script = "/home/bjorn/deploy_tmp.sh"
-            try:
-                content = _DEPLOY_SCRIPT.replace("\r\n", "\n").replace("\r", "\n")
-                sftp.putfo(io.BytesIO(content.encode("utf-8")), remote_script)
-            finally:
-                sftp.close()
+            self.log("[RUN] Extracting Bjorn.zip to /home/bjorn/Bjorn ...", "info")
 
-            self.exec_simple(f"chmod +x {shlex.quote(remote_script)}", timeout=10)
+            # The deploy script travels inside the command line itself, so
+            # there is no temp file to upload, chmod and remove.  It is not
+            # piped through ``bash -s``: stdin carries the sudo password,
+            # which bash would run as a command when sudo needs none.
             password = self._config.sudo_password or self._config.password or ""
             exit_code, out, err = self.exec_simple(
-                f"sudo -S bash {shlex.quote(remote_script)}",
+                "sudo -S -p '' bash -c " + shlex.quote(_DEPLOY_SCRIPT),
                 input_data=password + "\n",
                 timeout=120,
             )
-            # Cleanup script
-            self.exec_simple(f"rm -f {shlex.quote(remote_script)}", timeout=10)
 
             if out.strip():
                 self.log(out.strip())
@@ -279,12 +540,34 @@ class SSHWorker:
                 pass  # already exists
 
             local_lib = os.path.join(assets_dir, "lib")
-            for fname in sorted(os.listdir(local_lib)):
-                if fname.endswith(".sh"):
-                    local_path = os.path.join(local_lib, fname)
-                    remote_path = f"{remote_lib}/{fname}"
+            names = [f for f in sorted(os.listdir(local_lib)) if f.endswith(".sh")]
+
+            def upload_group(group_sftp: paramiko.SFTPClient, group: list) -> None:
+                for fname in group:
                     self.log(f"[SFTP] Uploading lib/{fname}")
-                    _upload_text_lf(sftp, local_path, remote_path)
+                    _upload_text_lf(
+                        group_sftp, os.path.join(local_lib, fname), f"{remote_lib}/{fname}"
+                    )
+
+            def upload_group_own_session(group: list) -> None:
+                group_sftp = client.open_sftp()
+                try:
+                    upload_group(group_sftp, group)
+                finally:
+                    group_sftp.close()
+
+            # Small files are RTT-bound: spread them over a few SFTP
+            # sessions; this thread handles the first group on `sftp`.
+            workers = min(LIB_UPLOAD_WORKERS, len(names))
+            groups = [names[i::workers] for i in range(workers)]
+            if len(groups) > 1:
+                with ThreadPoolExecutor(len(groups) - 1, "sftp-lib") as pool:
+                    futures = [pool.submit(upload_group_own_session, g) for g in groups[1:]]
+                    upload_group(sftp, groups[0])
+                    for future in futures:
+                        future.result()
+            elif groups:
+                upload_group(sftp, groups[0])
 
             self.log("[SFTP] All install scripts uploaded", "success")
             return remote_script
@@ -300,13 +583,8 @@ class SSHWorker:
         try:
             password = self._config.sudo_password or self._config.password or ""
 
-            # Map EPD choice number to version string
-            epd_map = {
-                1: "epd2in13", 2: "epd2in13_V2", 3: "epd2in13_V3",
-                4: "epd2in13_V4", 5: "epd2in7",
-            }
             epd_choice = params.get("epd_choice", 4)
-            epd_version = epd_map.get(int(epd_choice), "epd2in13_V4")
+            epd_version = _EPD_MAP.get(int(epd_choice), _DEFAULT_EPD)
 
             operation_mode = str(params.get("operation_mode", "") or "").strip().lower()
             if operation_mode not in {"auto", "manual", "ai"}:
@@ -317,23 +595,22 @@ class SSHWorker:
             bt_mac = params.get("bt_mac", "60:57:C8:47:E3:88")
             git_branch = params.get("git_branch", "main")
             install_mode = params.get("install_mode", "online")
-            install_mode_flag = {
-                "online": "-online", "local": "-local", "debug": "-debug",
-            }.get(install_mode, "-online")
-
-            # Build env vars for non-interactive mode
-            env_parts = [
-                "NON_INTERACTIVE=1",
-                f"EPD_VERSION={shlex.quote(epd_version)}",
-                f"OPERATION_MODE={shlex.quote(operation_mode)}",
-                f"MANUAL_MODE={shlex.quote(manual_mode)}",
-                f"enable_auth={shlex.quote(enable_auth)}",
-                f"WEBUI_PASSWORD={shlex.quote(web_pass)}",
-                f"WEBUI_PASSWORD_CONFIRM={shlex.quote(web_pass)}",
-                f"BLUETOOTH_MAC_ADDRESS={shlex.quote(bt_mac)}",
-                f"GIT_BRANCH={shlex.quote(git_branch)}",
-            ]
-            env_str = " ".join(env_parts)
+            install_mode_flag = _INSTALL_MODE_FLAGS.get(install_mode, "-online")
+
+            # Env vars for non-interactive mode; the password is quoted once
+            # and reused for the confirmation field
+            quoted_pass = shlex.quote(web_pass)
+            env_str = (
+                f"NON_INTERACTIVE=1"
+                f" EPD_VERSION={shlex.quote(epd_version)}"
+                f" OPERATION_MODE={shlex.quote(operation_mode)}"
+                f" MANUAL_MODE={shlex.quote(manual_mode)}"
+                f" enable_auth={shlex.quote(enable_auth)}"
+                f" WEBUI_PASSWORD={quoted_pass}"
+                f" WEBUI_PASSWORD_CONFIRM={quoted_pass}"
+                f" BLUETOOTH_MAC_ADDRESS={shlex.quote(bt_mac)}"
+                f" GIT_BRANCH={shlex.quote(git_branch)}"
+            )
 
             # chmod the script
             self.exec_simple(f"chmod +x {shlex.quote(script_path_remote)}", timeout=10)
@@ -361,8 +638,7 @@ exit 0
             finally:
                 sftp.close()
 
-            self.exec_simple(f"chmod +x {shlex.quote(remote_runner)}", timeout=10)
-
+            # No chmod for the runner: it is always started as ``bash runner``
             self.log(f"[RUN] Starting installation (branch={git_branch}, mode={install_mode}, operation={operation_mode})")
             self.log(f"[RUN] Remote stream log: {remote_stream_log}", "info")
 
@@ -392,7 +668,7 @@ exit 0
                 "remote_runner": remote_runner,
                 "remote_stream_log": remote_stream_log,
                 "remote_status_file": remote_status_file,
-                "next_line": 1,
+                "next_offset": 0,
                 "finished": False,
                 "result": None,
             }
@@ -413,32 +689,47 @@ exit 0
             None if monitoring was interrupted before the final result was known.
         """
         reconnect_attempts = 0
-        next_line = int(session.get("next_line", 1) or 1)
+        # Byte offset of the first unread byte of the remote stream log.
+        # Each poll fetches only the new tail, so the Pi never rescans
+        # what was already shown (sed -n 'N,$p' re-read N lines per poll).
+        next_offset = int(session.get("next_offset", 0) or 0)
         remote_runner = str(session["remote_runner"])
         remote_stream_log = str(session["remote_stream_log"])
         remote_status_file = str(session["remote_status_file"])
+        quoted_log = shlex.quote(remote_stream_log)
+
+        def emit_new_lines(final: bool = False) -> None:
+            nonlocal next_offset
+            # tail -c +K starts at the K-th byte (1-based)
+            _, data, _ = self._exec_raw(
+                f"tail -c +{next_offset + 1} {quoted_log} 2>/dev/null || true",
+                timeout=20,
+            )
+            # Hold back a trailing partial line until its newline arrives
+            # (or the installer has finished).
+            cut = len(data) if final else data.rfind(b"\n") + 1
+            if not cut:
+                return
+            next_offset += cut
+            session["next_offset"] = next_offset
+            self.log_lines([
+                m.group().decode("utf-8", errors="replace")
+                for m in _LINE_BYTES.finditer(data, 0, cut)
+                if not m.group().isspace()
+            ])
+            # Only the latest step marker in the chunk matters for the bar
+            step = None
+            for step in _STEP_BYTES.finditer(data, 0, cut):
+                pass
+            if step is not None:
+                current, total = int(step.group(1)), int(step.group(2))
+                self.update_progress(current, total, f"Step {current}/{total}")
 
         while True:
             try:
                 reconnect_attempts = 0
 
-                log_command = (
-                    f"sed -n '{next_line},$p' {shlex.quote(remote_stream_log)} 2>/dev/null || true"
-                )
-                _, log_out, _ = self.exec_simple(log_command, timeout=20)
-                all_lines = log_out.splitlines()
-                for line in all_lines:
-                    if not line.strip():
-                        continue
-                    self.log(line, "info")
-                    m = STEP_PATTERN.search(line)
-                    if m:
-                        self.update_progress(
-                            int(m.group(1)), int(m.group(2)),
-                            f"Step {m.group(1)}/{m.group(2)}"
-                        )
-                next_line += len(all_lines)
-                session["next_line"] = next_line
+                emit_new_lines()
 
                 _, status_out, _ = self.exec_simple(
                     f"cat {shlex.quote(remote_status_file)} 2>/dev/null || true",
@@ -446,6 +737,9 @@ exit 0
                 )
                 status_text = status_out.strip()
                 if status_text:
+                    # The log is complete once the status file exists; pick
+                    # up whatever was written after the poll above.
+                    emit_new_lines(final=True)
                     try:
                         rc = int(status_text.splitlines()[-1].strip())
                     except ValueError:
@@ -484,7 +778,7 @@ exit 0
                     self.log("[RUN] Unable to reconnect to monitor the remote installer", "error")
                     session["finished"] = False
                     session["result"] = None
-                    session["next_line"] = next_line
+                    session["next_offset"] = next_offset
                     return None
                 time.sleep(2.0)
 
@@ -604,18 +898,49 @@ exit 0
             )
             channel = stdout.channel
 
-            while not stop_event.is_set():
-                if channel.recv_ready():
-                    data = channel.recv(4096).decode("utf-8", errors="replace")
-                    for line in data.splitlines():
+            # channel.fileno() is signalled when data arrives or the channel
+            # closes, so the thread sleeps until there is something to read.
+            selector = selectors.DefaultSelector()
+            selector.register(channel, selectors.EVENT_READ)
+            # Bytes after the last newline seen; carried into the next recv so
+            # lines (and multi-byte UTF-8 sequences) split across chunks stay
+            # whole.  Appended in place rather than re-concatenated.
+            pending = bytearray()
+            try:
+                while not stop_event.is_set():
+                    if channel.recv_ready():
+                        chunk = channel.recv(4096)
+                        if not chunk:
+                            break  # EOF
+                        pending.extend(chunk)
+                        cut = pending.rfind(b"\n") + 1
+                        if not cut and len(pending) < 65536:
+                            continue
+                        if not cut:
+                            cut = len(pending)  # runaway line: flush as-is
+                        data = pending[:cut].decode("utf-8", errors="replace")
+                        del pending[:cut]
                         if stop_event.is_set():
                             break
-                        if line.strip():
-                            self.log(f"[BJORN] {line}", "info")
-                elif channel.exit_status_ready():
-                    break
-                else:
-                    time.sleep(0.1)
+                        self.log_lines(
+                            [f"[BJORN] {line}" for line in data.splitlines() if line.strip()]
+                        )
+                    elif (
+                        channel.eof_received
+                        or channel.exit_status_ready()
+                        or channel.closed
+                    ):
+                        # After EOF the fileno stays readable; selecting
+                        # again would spin until the exit status arrives.
+                        break
+                    else:
+                        selector.select(LOG_STREAM_STOP_POLL)
+            finally:
+                selector.close()
+
+            # A last line without its trailing newline
+            if pending.strip() and not stop_event.is_set():
+                self.log(f"[BJORN] {pending.decode('utf-8', errors='replace')}", "info")
 
             channel.close()
         except Exception as exc:
@@ -12,22 +12,38 @@ The old approach had three fatal flaws:
 JSBridge fixes all three by funnelling every JS call through an internal queue
 consumed by a single dedicated thread.  Calls made before the window is ready
 are buffered automatically and flushed once ``mark_ready()`` is invoked.
+Whatever has queued up while the consumer was busy is submitted as a single
+script, so a burst of calls costs one ``evaluate_js`` round trip.  Calls
+that only set a current state (progress, status) are coalesced so that a
+backlog delivers just the newest value.
 """
 
 from __future__ import annotations
 
+import collections
 import json
-import queue
 import threading
 from typing import Any
 
+# Upper bound on calls folded into one ``evaluate_js`` submission
+BATCH_MAX_CALLS = 256
+
+# Pending calls kept before the oldest are dropped (e.g. a log flood while
+# the window is hung)
+QUEUE_MAX_CALLS = 8192
+
+# Functions whose latest call supersedes any still-pending earlier call
+COALESCED_FUNCTIONS = frozenset({"updateProgress", "updateStatus"})
+
 
 class JSBridge:
     """Thread-safe bridge for calling JavaScript functions from Python threads.
 
     Uses an internal queue and a dedicated consumer thread to serialise all JS
     calls.  Calls are buffered until the window signals readiness, then the
-    queue is flushed in order.
+    queue is flushed in order.  For ``COALESCED_FUNCTIONS`` the queue holds
+    only a placeholder at the position of the first pending call; the
+    arguments of the most recent call are looked up when it is executed.
 
     Typical lifecycle::
 
@@ -42,7 +58,15 @@ class JSBridge:
     def __init__(self) -> None:
         self._window: Any = None
         self._ready = threading.Event()
-        self._queue: queue.Queue[tuple[str, tuple] | None] = queue.Queue()
+        # (function, args) items; args is None for a coalesced placeholder
+        # deque append/popleft are atomic, so producers never take a lock;
+        # the event only wakes the consumer.
+        self._queue: collections.deque[tuple[str, tuple | None] | None] = (
+            collections.deque()
+        )
+        self._wakeup = threading.Event()
+        self._latest: dict[str, tuple] = {}
+        self._latest_lock = threading.Lock()
         self._consumer_thread: threading.Thread | None = None
         self._stop = threading.Event()
 
@@ -58,9 +82,12 @@ class JSBridge:
         """Signal that the window's DOM is loaded and ``BJORNInterface`` exists.
 
         Starts the consumer thread which will immediately begin draining any
-        buffered calls.
+        buffered calls.  Repeated calls (e.g. a page reload firing the loaded
+        event again) reuse the running consumer.
         """
         self._ready.set()
+        if self._consumer_thread is not None and self._consumer_thread.is_alive():
+            return
         self._stop.clear()
         self._consumer_thread = threading.Thread(
             target=self._consume_loop,
@@ -72,49 +99,91 @@ class JSBridge:
     def call(self, function: str, *args: Any) -> None:
         """Queue a JS function call.
 
-        Thread-safe, never blocks the caller, never drops messages.
+        Thread-safe and never blocks the caller.  Past ``QUEUE_MAX_CALLS``
+        pending calls the oldest one is dropped.
         """
-        self._queue.put((function, args))
+        if function in COALESCED_FUNCTIONS:
+            with self._latest_lock:
+                pending = function in self._latest
+                self._latest[function] = args
+            if pending:
+                return  # the queued placeholder will pick up these args
+            self._put((function, None))
+        else:
+            self._put((function, args))
 
     def call_raw(self, js_code: str) -> None:
         """Queue raw JavaScript code for execution."""
-        self._queue.put(("__raw__", (js_code,)))
+        self._put(("__raw__", (js_code,)))
 
     def stop(self) -> None:
         """Stop the consumer thread gracefully."""
         self._stop.set()
-        self._queue.put(None)  # sentinel to unblock the consumer
+        self._put(None)  # sentinel to unblock the consumer
         if self._consumer_thread is not None and self._consumer_thread.is_alive():
             self._consumer_thread.join(timeout=2)
 
+    def _put(self, item: tuple[str, tuple | None] | None) -> None:
+        """Enqueue *item*, evicting the oldest pending call when full."""
+        if len(self._queue) >= QUEUE_MAX_CALLS:
+            try:
+                dropped = self._queue.popleft()
+            except IndexError:  # the consumer emptied it meanwhile
+                dropped = None
+            if dropped is not None and dropped[1] is None:
+                # Evicted a placeholder: forget its args too, or later
+                # calls would wait on a placeholder that no longer exists
+                with self._latest_lock:
+                    self._latest.pop(dropped[0], None)
+        self._queue.append(item)
+        self._wakeup.set()
+
     # ------------------------------------------------------------------
     # Internal – runs exclusively on the consumer thread
     # ------------------------------------------------------------------
 
     def _consume_loop(self) -> None:
-        """Wait for readiness, then process queued items one at a time."""
+        """Wait for readiness, then drain queued items in batches."""
         self._ready.wait(timeout=30)
         if not self._ready.is_set():
             print("[ERROR] JSBridge: window never became ready (30 s timeout)")
             return
 
-        while not self._stop.is_set():
-            try:
-                item = self._queue.get(timeout=0.5)
-            except queue.Empty:
-                continue
-
-            if item is None:
+        stop = False
+        while not stop:
+            # Sleep until a producer signals work; stop() posts a sentinel.
+            # Clearing before draining means a call that lands mid-drain
+            # re-arms the event instead of being missed.
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stop.is_set():
                 break
 
-            function, args = item
-            try:
-                self._execute(function, args)
-            except Exception as exc:  # noqa: BLE001
-                print(f"[ERROR] JSBridge consumer: {exc}")
-
-    def _execute(self, function: str, args: tuple) -> None:
-        """Translate a queued item into an ``evaluate_js`` call.
+            # Sweep up everything queued, BATCH_MAX_CALLS per submission
+            while self._queue and not stop:
+                batch = []
+                while len(batch) < BATCH_MAX_CALLS:
+                    try:
+                        item = self._queue.popleft()
+                    except IndexError:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+
+                try:
+                    self._execute_batch(batch)
+                except Exception as exc:  # noqa: BLE001
+                    print(f"[ERROR] JSBridge consumer: {exc}")
+
+    def _execute_batch(self, batch: list[tuple[str, tuple | None]]) -> None:
+        """Submit queued items with as few ``evaluate_js`` calls as possible.
+
+        Interface calls are joined into one script, each with its own guard
+        and ``try`` so a throwing handler doesn't skip the rest.  Raw code is
+        submitted on its own, in order, since a syntax error in it would
+        void the whole script.
 
         This method is only ever invoked from the single consumer thread,
         so there is no risk of concurrent ``evaluate_js`` calls.
@@ -122,21 +191,34 @@ class JSBridge:
         if self._window is None:
             return
 
-        if function == "__raw__":
-            self._window.evaluate_js(args[0])
+        statements: list[str] = []
+        for function, args in batch:
+            if args is None:
+                with self._latest_lock:
+                    args = self._latest.pop(function, None)
+                if args is None:
+                    continue
+            if function == "__raw__":
+                self._submit(statements)
+                statements = []
+                self._submit([args[0]])
+                continue
+            args_str = ", ".join(self._serialise_args(args))
+            statements.append(
+                f"if (typeof BJORNInterface !== 'undefined' "
+                f"&& BJORNInterface.{function}) {{ "
+                f"try {{ BJORNInterface.{function}({args_str}); }} "
+                f"catch (e) {{ console.error('{function}', e); }} }}"
+            )
+        self._submit(statements)
+
+    def _submit(self, statements: list[str]) -> None:
+        if not statements:
             return
-
-        js_args = self._serialise_args(args)
-        args_str = ", ".join(js_args)
-        js_code = (
-            f"if (typeof BJORNInterface !== 'undefined' "
-            f"&& BJORNInterface.{function}) {{ "
-            f"BJORNInterface.{function}({args_str}); }}"
-        )
         try:
-            self._window.evaluate_js(js_code)
+            self._window.evaluate_js("\n".join(statements))
         except Exception as exc:  # noqa: BLE001
-            print(f"[ERROR] JSBridge._execute({function}): {exc}")
+            print(f"[ERROR] JSBridge.evaluate_js ({len(statements)} calls): {exc}")
 
     # ------------------------------------------------------------------
     # Helpers
@@ -144,23 +226,10 @@ class JSBridge:
 
     @staticmethod
     def _serialise_args(args: tuple) -> list[str]:
-        """Convert Python values to their JavaScript literal representations."""
-        js_args: list[str] = []
-        for arg in args:
-            if isinstance(arg, bool):
-                js_args.append("true" if arg else "false")
-            elif isinstance(arg, (dict, list)):
-                js_args.append(json.dumps(arg, default=str))
-            elif isinstance(arg, str):
-                escaped = (
-                    arg.replace("\\", "\\\\")
-                    .replace('"', '\\"')
-                    .replace("\n", "\\n")
-                    .replace("\r", "")
-                )
-                js_args.append(f'"{escaped}"')
-            elif arg is None:
-                js_args.append("null")
-            else:
-                js_args.append(str(arg))
-        return js_args
+        """Convert Python values to their JavaScript literal representations.
+
+        JSON literals are valid JavaScript, and the default ``ensure_ascii``
+        output escapes every control character as well as U+2028/U+2029,
+        which a hand-rolled escape chain easily misses.
+        """
+        return [json.dumps(arg, default=str) for arg in args]
@@ -62,6 +62,9 @@ LINUX_HIDDEN_IMPORTS = [
     "PyQt6.QtWebEngineWidgets",
 ]
 
+# RAM-backed scratch dir for PyInstaller's intermediate files on Linux
+LINUX_TMPFS_WORKPATH = os.path.join("/dev/shm", "pyi-bjorn")
+
 EXCLUDED_BUILD_PATHS = {
     "wiki",
     ".nojekyll",
@@ -120,6 +123,31 @@ def get_icon_arg() -> list[str]:
     return []
 
 
+def list_parent_dirs(paths: list[str]) -> dict[str, set[str]]:
+    """Map each parent directory of *paths* to the names it contains.
+
+    One ``scandir`` per directory answers every existence check below,
+    instead of one ``stat`` per data file.
+    """
+    entries: dict[str, set[str]] = {}
+    for path in paths:
+        parent = os.path.dirname(path) or "."
+        if parent not in entries:
+            try:
+                with os.scandir(parent) as it:
+                    entries[parent] = {entry.name for entry in it}
+            except OSError:
+                entries[parent] = set()
+    return entries
+
+
+def get_workpath_arg() -> list[str]:
+    """Return a tmpfs ``--workpath`` on Linux hosts that have /dev/shm."""
+    if sys.platform.startswith("linux") and os.path.isdir("/dev/shm"):
+        return [f"--workpath={LINUX_TMPFS_WORKPATH}"]
+    return []
+
+
 def build(version: str) -> None:
     """Run PyInstaller with the configured options."""
     project_dir = os.path.dirname(os.path.abspath(__file__))
@@ -133,13 +161,15 @@ def build(version: str) -> None:
 
     sep = ";" if sys.platform == "win32" else ":"
     add_data_args = []
+    existing = list_parent_dirs([src for src, _ in DATA_FILES])
     for src, dst in DATA_FILES:
-        normalized = src.replace("\\", "/").lstrip("./")
+        # removeprefix, not lstrip: lstrip("./") also ate the dot of ".nojekyll"
+        normalized = src.replace("\\", "/").removeprefix("./")
         root_name = normalized.split("/", 1)[0]
         if normalized in EXCLUDED_BUILD_PATHS or root_name in EXCLUDED_BUILD_PATHS:
             print(f"[INFO] Excluded from build by policy: {src}")
             continue
-        if os.path.exists(src):
+        if os.path.basename(src) in existing[os.path.dirname(src) or "."]:
             add_data_args.extend(["--add-data", f"{src}{sep}{dst}"])
         else:
             print(f"[WARNING] Data file not found, skipping: {src}")
@@ -165,6 +195,7 @@ def build(version: str) -> None:
         "--clean",
         "--noconfirm",
         f"--name={exe_name}",
+        *get_workpath_arg(),
         *icon_arg,
         *add_data_args,
         *hidden_args,